@@ -39,4 +39,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # installed with the "fast" extra
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
@@ -1,10 +1,17 @@
+import asyncio
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from typing import Optional, Union, List, Callable
 from pydantic import BaseModel
 from .request import PaginationQuery
 
 SHOW_REQUEST_ID = os.getenv("SHOW_REQUEST_ID") or False
 
+# plain decimal notation only: "NaN", "Infinity" or "1e5" are left as text
+_DECIMAL_RE = re.compile(r"-?\d+(\.\d+)?")
+
 
 class UnsuccessfulResponse(Exception):
     pass
@@ -23,6 +30,7 @@ class Pagination(BaseModel):
     limit: Optional[int] = None
     order: Optional[str] = None
     has_next_page: Optional[bool] = False
+    next_cursor: Optional[str] = None
 
 
 class APIResponse(BaseModel):
@@ -32,6 +40,59 @@ class APIResponse(BaseModel):
     pagination: Optional[Pagination] = None
 
 
+class LazyDecimalRecord:
+    """
+    Read-only view of a result record with numeric fields as Decimal.
+
+    Fields are converted on first attribute access and memoized, so records
+    with many decimal strings cost nothing until they are actually read.
+    Only strings in plain decimal notation are converted, identifiers
+    (``id`` and ``*_id`` fields) are always returned as they are.
+    Indexing returns the raw value.
+
+    Example:
+    .. code-block:: python
+
+        for balance in rabbitx.vaults.holdings(vault_profile_id=1).records():
+            print(balance.stake_shares)  # Decimal
+            print(balance["stake_shares"])  # str
+    """
+
+    __slots__ = ("_raw", "_converted")
+
+    def __init__(self, raw: dict):
+        self._raw = raw
+        self._converted = None
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        converted = self._converted
+        if converted is not None and name in converted:
+            return converted[name]
+        try:
+            value = self._raw[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        if (
+            isinstance(value, str)
+            and _DECIMAL_RE.fullmatch(value)
+            and name != "id"
+            and not name.endswith("_id")
+        ):
+            value = Decimal(value)
+        if converted is None:
+            converted = self._converted = {}
+        converted[name] = value
+        return value
+
+    def __getitem__(self, key: str):
+        return self._raw[key]
+
+    def __repr__(self) -> str:
+        return f"LazyDecimalRecord({self._raw!r})"
+
+
 class SingleResponse:
     def __init__(self, response: APIResponse):
         self.response = response
@@ -67,6 +128,18 @@ class MultipleResponse:
         while response.has_next_page:
             response = response.next_page()
             print(response.result())
+
+    Iterating over the response yields the results of all pages. The next page
+    is requested in the background while the current one is being consumed.
+
+    .. code-block:: python
+
+        for order in rabbitx.orders.list(market_id="BTC-USD"):
+            print(order)
+
+        # async version
+        async for order in await rabbitx.orders.list(market_id="BTC-USD"):
+            print(order)
     """
 
     def __init__(
@@ -83,6 +156,12 @@ class MultipleResponse:
         """
         return self.response.result
 
+    def records(self) -> List[LazyDecimalRecord]:
+        """
+        Returns the list of results wrapped in LazyDecimalRecord.
+        """
+        return [LazyDecimalRecord(item) for item in self.response.result]
+
     @property
     def has_next_page(self) -> bool:
         """
@@ -92,6 +171,39 @@ class MultipleResponse:
             self.response.pagination and self.response.pagination.has_next_page
         ) or False
 
+    def __iter__(self):
+        response = self
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                next_page = (
+                    executor.submit(response.next_page)
+                    if response.has_next_page
+                    else None
+                )
+                yield from response.result()
+                if next_page is None:
+                    return
+                response = next_page.result()
+
+    async def __aiter__(self):
+        response = self
+        next_page = None
+        try:
+            while True:
+                next_page = (
+                    asyncio.ensure_future(response.next_page())
+                    if response.has_next_page
+                    else None
+                )
+                for item in response.result():
+                    yield item
+                if next_page is None:
+                    return
+                response = await next_page
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
     def next_page(self) -> "MultipleResponse":
         """
         Returns a MultipleResponse object with the next page of results.
@@ -102,13 +214,21 @@ class MultipleResponse:
         if not self.has_next_page:
             raise NoNextPage()
 
-        pagination = PaginationQuery(
-            p_page=self.response.pagination.page + 1 if self.response.pagination else 1,
-            p_limit=self.response.pagination.limit if self.response.pagination else 50,
-            p_order=self.response.pagination.order
-            if self.response.pagination
-            else "DESC",
-        )
+        current = self.response.pagination
+
+        if current.next_cursor is not None:
+            # keyset pagination: the server continues right after the cursor
+            pagination = PaginationQuery(
+                p_cursor=current.next_cursor,
+                p_limit=current.limit or 50,
+                p_order=current.order or "DESC",
+            )
+        else:
+            pagination = PaginationQuery(
+                p_page=(current.page or 0) + 1,
+                p_limit=current.limit or 50,
+                p_order=current.order or "DESC",
+            )
 
         return self.next_page_func(pagination)
 
@@ -183,7 +303,7 @@ def collect_pages(response: MultipleResponse) -> list:
         for order in collect_pages(response):
             print(order)
     """
-    results = response.result()
+    results = list(response.result())
     while response.has_next_page:
         response = response.next_page()
         results.extend(response.result())
@@ -207,7 +327,7 @@ async def collect_pages_async(response: MultipleResponse) -> list:
         for order in await collect_pages_async(response):
             print(order)
     """
-    results = response.result()
+    results = list(response.result())
     while response.has_next_page:
         response = await response.next_page()
         results.extend(response.result())
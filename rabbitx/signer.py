@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from rabbitx.xutils import new_payload, payload_hash, rbt_signature
+from rabbitx.xutils import RbtSigner
 from rabbitx.xtime import get_current_timestamp
 from rabbitx.apikey import ApiKey
 from rabbitx.eip712 import eip712_message, sign_message
@@ -32,21 +32,21 @@ class ApiSigner(Signer):
 
     def __init__(self, api_key: ApiKey):
         self.api_key = api_key
+        self._static_headers = {"RBT-API-KEY": api_key.key}
+        self._rbt_signer = RbtSigner(api_key.secret)
 
     def headers(self, method: str, endpoint: str, payload={}) -> dict:
         timestamp = get_current_timestamp() + 15
-        sorted_payload = new_payload(method.upper(), endpoint, params=payload)
-        hashed_payload = payload_hash(timestamp, sorted_payload)
-        signature = rbt_signature(hashed_payload, self.api_key.secret)
+        signature = self._rbt_signer.sign_request(
+            timestamp, method.upper(), endpoint, payload
+        )
 
-        headers = {
+        return {
+            **self._static_headers,
             "RBT-TS": str(timestamp),
-            "RBT-API-KEY": self.api_key.key,
             "RBT-SIGNATURE": signature,
         }
 
-        return headers
-
 
 class EIP712Signer(Signer):
     """
@@ -112,17 +112,17 @@ class JWTTokenSigner(Signer):
         self.jwt_token = jwt_token
         self.refresh_token = refresh_token
         self.random_secret = random_secret
+        self._static_headers = {"RBT-JWT": jwt_token}
+        self._rbt_signer = RbtSigner(random_secret)
 
     def headers(self, method: str, endpoint: str, payload={}) -> dict:
         timestamp = get_current_timestamp() + 15
-        sorted_payload = new_payload(method.upper(), endpoint, params=payload)
-        hashed_payload = payload_hash(timestamp, sorted_payload)
-        signature = rbt_signature(hashed_payload, self.random_secret)
+        signature = self._rbt_signer.sign_request(
+            timestamp, method.upper(), endpoint, payload
+        )
 
-        headers = {
+        return {
+            **self._static_headers,
             "RBT-SIGNATURE": signature,
             "RBT-TS": str(timestamp),
-            "RBT-JWT": self.jwt_token,
         }
-
-        return headers
@@ -3,23 +3,35 @@ import json
 import os
 from decimal import Decimal
 import logging
+import ssl
 import httpx
 from abc import ABC, abstractmethod
+from typing import Optional
 
 DEBUG = os.getenv("DEBUG", False)
 
 if DEBUG:
-    import http.client as http_client
-
-    http_client.HTTPConnection.debuglevel = 1
-
     logging.basicConfig(level=logging.DEBUG)
-    requests_log = logging.getLogger("requests.packages.urllib3")
-    requests_log.setLevel(logging.DEBUG)
-    requests_log.propagate = True
+    httpx_log = logging.getLogger("httpx")
+    httpx_log.setLevel(logging.DEBUG)
+    httpx_log.propagate = True
 
 logger = logging.getLogger("rabbitx.transport")
 
+try:
+    import h2  # noqa: F401
+
+    # concurrent requests share one multiplexed connection
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Certificate verification is disabled for the API clients. The context is
+# built once and shared by every client instead of per client construction.
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.check_hostname = False
+_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
 
 class CustomEncoder(json.JSONEncoder):
     """
@@ -52,13 +64,13 @@ class Transport(ABC):
         The headers to send with the request
     """
 
-    def __init__(self, base_url: str, signer: Signer, headers: dict = {}):
+    def __init__(self, base_url: str, signer: Signer, headers: Optional[dict] = None):
         self.base_url = base_url
         self.signer = signer
-        self.headers = headers
+        self.headers = headers or {}
 
     @abstractmethod
-    def get(self, endpoint: str, params: dict = {}):
+    def get(self, endpoint: str, params: Optional[dict] = None):
         """
         Send a GET request to the specified endpoint.
 
@@ -67,7 +79,7 @@ class Transport(ABC):
         endpoint : str
             The API endpoint to send the request to
         params : dict, optional
-            Query parameters to include in the request, by default {}
+            Query parameters to include in the request, by default None
 
         Returns
         -------
@@ -77,7 +89,9 @@ class Transport(ABC):
         pass
 
     @abstractmethod
-    def post(self, endpoint: str, body: dict = {}, headers: dict = {}):
+    def post(
+        self, endpoint: str, body: Optional[dict] = None, headers: Optional[dict] = None
+    ):
         """
         Send a POST request to the specified endpoint.
 
@@ -86,9 +100,9 @@ class Transport(ABC):
         endpoint : str
             The API endpoint to send the request to
         body : dict, optional
-            The request body, by default {}
+            The request body, by default None
         headers : dict, optional
-            Additional headers to include in the request, by default {}
+            Additional headers to include in the request, by default None
 
         Returns
         -------
@@ -98,7 +112,7 @@ class Transport(ABC):
         pass
 
     @abstractmethod
-    def put(self, endpoint: str, body: dict = {}):
+    def put(self, endpoint: str, body: Optional[dict] = None):
         """
         Send a PUT request to the specified endpoint.
 
@@ -107,7 +121,7 @@ class Transport(ABC):
         endpoint : str
             The API endpoint to send the request to
         body : dict, optional
-            The request body, by default {}
+            The request body, by default None
 
         Returns
         -------
@@ -117,7 +131,7 @@ class Transport(ABC):
         pass
 
     @abstractmethod
-    def delete(self, endpoint: str, body: dict = {}):
+    def delete(self, endpoint: str, body: Optional[dict] = None):
         """
         Send a DELETE request to the specified endpoint.
 
@@ -126,7 +140,7 @@ class Transport(ABC):
         endpoint : str
             The API endpoint to send the request to
         body : dict, optional
-            The request body, by default {}
+            The request body, by default None
 
         Returns
         -------
@@ -152,22 +166,26 @@ class SyncTransport(Transport):
         The underlying HTTP client
     """
 
-    def __init__(self, base_url: str, signer: Signer, headers: dict = {}):
+    def __init__(self, base_url: str, signer: Signer, headers: Optional[dict] = None):
         super().__init__(base_url, signer, headers)
-        self.client = httpx.Client(verify=False)
+        # keep-alive connections are pooled and reused between calls; no
+        # custom transport, so HTTP(S)_PROXY/ALL_PROXY from the env still apply
+        self.client = httpx.Client(verify=_SSL_CONTEXT, http2=_HTTP2)
 
     def _request(
         self,
         method: str,
         endpoint: str,
-        params: dict = {},
-        body: dict = {},
-        headers: dict = {},
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+        headers: Optional[dict] = None,
     ):
-        self.client.headers = self.signer.headers(method, endpoint, body)
-        self.client.headers.update(self.headers)
-        self.client.headers.update(headers)
-        self.client.headers.update({"X-RBT-Client": "desktop"})
+        body = body or {}
+        request_headers = self.signer.headers(method, endpoint, body)
+        request_headers.update(self.headers)
+        if headers:
+            request_headers.update(headers)
+        request_headers["X-RBT-Client"] = "desktop"
 
         body_json = json.dumps(body, indent=2, cls=CustomEncoder)
 
@@ -176,24 +194,32 @@ class SyncTransport(Transport):
             url=f"{self.base_url}{endpoint}",
             params=params,
             content=body_json,
-            # verify=False,
+            headers=request_headers,
         )
 
-        if DEBUG:
-            logger.debug(f"Response: {response.text}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response: %s", response.text)
 
         return response
 
-    def get(self, endpoint: str, params: dict = {}):
+    def close(self):
+        """
+        Close the underlying client and its pooled connections.
+        """
+        self.client.close()
+
+    def get(self, endpoint: str, params: Optional[dict] = None):
         return self._request("GET", endpoint=endpoint, params=params)
 
-    def post(self, endpoint: str, body: dict = {}, headers: dict = {}):
+    def post(
+        self, endpoint: str, body: Optional[dict] = None, headers: Optional[dict] = None
+    ):
         return self._request("POST", endpoint=endpoint, body=body, headers=headers)
 
-    def put(self, endpoint: str, body: dict = {}):
+    def put(self, endpoint: str, body: Optional[dict] = None):
         return self._request("PUT", endpoint=endpoint, body=body)
 
-    def delete(self, endpoint: str, body: dict = {}):
+    def delete(self, endpoint: str, body: Optional[dict] = None):
         return self._request("DELETE", endpoint=endpoint, body=body)
 
 
@@ -213,35 +239,50 @@ class AsyncTransport(Transport):
         The underlying async HTTP client
     """
 
-    def __init__(self, base_url: str, signer: Signer, headers: dict = {}):
+    def __init__(self, base_url: str, signer: Signer, headers: Optional[dict] = None):
         super().__init__(base_url, signer, headers)
         self.client = None
 
     async def __aenter__(self):
-        self.client = httpx.AsyncClient(verify=False)
+        self.client = self._create_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the underlying client and its pooled connections.
+
+        A new client is created on the next request.
+        """
         if self.client:
             await self.client.aclose()
             self.client = None
 
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(verify=_SSL_CONTEXT, http2=_HTTP2)
+
     async def _ensure_client(self):
         if not self.client:
-            self.client = httpx.AsyncClient(verify=False)
+            self.client = self._create_client()
 
     async def _request(
         self,
         method: str,
         endpoint: str,
-        params: dict = {},
-        body: dict = {},
-        headers: dict = {},
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+        headers: Optional[dict] = None,
     ):
         await self._ensure_client()
-        self.client.headers = self.signer.headers(method, endpoint, body)
-        self.client.headers.update(self.headers)
-        self.client.headers.update(headers)
+        body = body or {}
+        request_headers = self.signer.headers(method, endpoint, body)
+        request_headers.update(self.headers)
+        if headers:
+            request_headers.update(headers)
+        request_headers["X-RBT-Client"] = "desktop"
 
         body_json = json.dumps(body, indent=2, cls=CustomEncoder)
 
@@ -250,23 +291,26 @@ class AsyncTransport(Transport):
             url=f"{self.base_url}{endpoint}",
             params=params,
             content=body_json,
+            headers=request_headers,
         )
 
-        if DEBUG:
-            logger.debug(f"Response: {response.text}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response: %s", response.text)
 
         return response
 
-    async def get(self, endpoint: str, params: dict = {}):
+    async def get(self, endpoint: str, params: Optional[dict] = None):
         return await self._request("GET", endpoint=endpoint, params=params)
 
-    async def post(self, endpoint: str, body: dict = {}, headers: dict = {}):
+    async def post(
+        self, endpoint: str, body: Optional[dict] = None, headers: Optional[dict] = None
+    ):
         return await self._request(
             "POST", endpoint=endpoint, body=body, headers=headers
         )
 
-    async def put(self, endpoint: str, body: dict = {}):
+    async def put(self, endpoint: str, body: Optional[dict] = None):
         return await self._request("PUT", endpoint=endpoint, body=body)
 
-    async def delete(self, endpoint: str, body: dict = {}):
+    async def delete(self, endpoint: str, body: Optional[dict] = None):
         return await self._request("DELETE", endpoint=endpoint, body=body)
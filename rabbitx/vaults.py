@@ -1,7 +1,106 @@
-from typing import Literal, List, Optional
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, List, Optional, Dict
 from .transport import Transport, AsyncTransport
 from .response import multiple_or_fail, MultipleResponse
 from .request import PaginationQuery
+from . import xjson
+
+
+MICROSECONDS = 1_000_000  # the API expects timestamps in microseconds
+
+
+def _request_params(pagination: Optional[PaginationQuery], **params) -> dict:
+    """Query parameters without the unset (falsy) ones, followed by pagination."""
+    request_params = {key: value for key, value in params.items() if value}
+    if pagination:
+        request_params.update(pagination)
+    return request_params
+
+
+def _parse(response, next_page_func) -> MultipleResponse:
+    response.raise_for_status()
+    return multiple_or_fail(xjson.loads(response.content), next_page_func)
+
+
+LIST_CACHE_TTL = 60  # seconds
+HISTORY_CACHE_TTL = 30  # seconds
+CACHE_MAX_ENTRIES = 256  # least recently used responses are evicted beyond this
+
+# method name -> (endpoint, cache TTL in seconds or None when not cached)
+_ENDPOINTS = {
+    "list": ("/vaults", LIST_CACHE_TTL),
+    "holdings": ("/vaults/holdings", None),
+    "all_balanceops": ("/vaults/all-balanceops", None),
+    "user_balanceops": ("/vaults/balanceops", None),
+    "history": ("/vaults/history", HISTORY_CACHE_TTL),
+    "fills": ("/vaults/fills", None),
+    "funding": ("/vaults/funding", None),
+}
+
+
+class _TTLCache:
+    """
+    Responses of idempotent GET requests which expire after a TTL.
+
+    At most ``max_entries`` responses are kept, expired ones are dropped first
+    and then the least recently used. Responses are copied in and out, so
+    callers can't change what the next caller gets.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _copy(response: MultipleResponse) -> MultipleResponse:
+        api_response = response.response
+        return MultipleResponse(
+            api_response.model_copy(update={"result": list(api_response.result)}),
+            response.next_page_func,
+        )
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[dict]) -> tuple:
+        # list params (e.g. ops_type) become tuples so the key stays hashable
+        return endpoint, tuple(
+            sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in (params or {}).items()
+            )
+        )
+
+    def get(self, key: tuple) -> Optional[MultipleResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return self._copy(response)
+
+    def set(self, key: tuple, response: MultipleResponse, ttl: float):
+        response = self._copy(response)
+        with self._lock:
+            entries = self._entries
+            now = time.monotonic()
+            entries[key] = (now + ttl, response)
+            entries.move_to_end(key)
+            if len(entries) > self._max_entries:
+                for expired in [k for k, (at, _) in entries.items() if at <= now]:
+                    del entries[expired]
+                while len(entries) > self._max_entries:
+                    entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class Vaults:
@@ -16,12 +115,37 @@ class Vaults:
         The transport object
     """
 
+    __slots__ = ("transport", "_cache")
+
     def __init__(self, transport: Transport):
         self.transport = transport
+        self._cache = _TTLCache()
 
-    def list(self, *, pagination: Optional[PaginationQuery] = None) -> MultipleResponse:
+    def _get(
+        self, name: str, params: dict, next_page_func, cache: bool = True
+    ) -> MultipleResponse:
+        endpoint, ttl = _ENDPOINTS[name]
+        if ttl:
+            cache_key = _TTLCache.key(endpoint, params)
+            if cache:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+        result = _parse(self.transport.get(endpoint, params=params), next_page_func)
+        if ttl:
+            self._cache.set(cache_key, result, ttl)
+        return result
+
+    def list(
+        self, *, pagination: Optional[PaginationQuery] = None, cache: bool = True
+    ) -> MultipleResponse:
         """Get list of vaults
 
+        Responses are cached for ``LIST_CACHE_TTL`` seconds.
+
+        :param cache: Return a cached response if there is one (optional), default is True
+        :type cache: bool
         :return: List of vaults
         :rtype: MultipleResponse
 
@@ -46,13 +170,11 @@ class Vaults:
                 }
             ]
         """
-        response = self.transport.get("/vaults", params=pagination)
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.list(pagination=pagination)
+            return self.list(pagination=pagination, cache=cache)
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return self._get("list", _request_params(pagination), next_page_func, cache)
 
     def holdings(
         self,
@@ -89,20 +211,14 @@ class Vaults:
             ]
         """
 
-        request_params = dict(pagination)
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-
-        response = self.transport.get(
-            "/vaults/holdings",
-            params=request_params,
-        )
-        response.raise_for_status()
+        request_params = _request_params(pagination, vault_profile_id=vault_profile_id)
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.holdings(pagination=pagination)
+            return self.holdings(
+                pagination=pagination, vault_profile_id=vault_profile_id
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return self._get("holdings", request_params, next_page_func)
 
     def all_balanceops(
         self,
@@ -145,22 +261,18 @@ class Vaults:
             ]
         """
 
-        request_params = dict(pagination)
-        if ops_types:
-            request_params["ops_type"] = ops_types
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-
-        response = self.transport.get(
-            "/vaults/all-balanceops",
-            params=request_params,
+        request_params = _request_params(
+            pagination, ops_type=ops_types, vault_profile_id=vault_profile_id
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.all_balanceops(pagination=pagination)
+            return self.all_balanceops(
+                pagination=pagination,
+                ops_types=ops_types,
+                vault_profile_id=vault_profile_id,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return self._get("all_balanceops", request_params, next_page_func)
 
     def user_balanceops(
         self,
@@ -203,35 +315,36 @@ class Vaults:
             ]
         """
 
-        request_params = dict(pagination)
-        if ops_types:
-            request_params["ops_type"] = ops_types
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-
-        response = self.transport.get(
-            "/vaults/balanceops",
-            params=request_params,
+        request_params = _request_params(
+            pagination, ops_type=ops_types, vault_profile_id=vault_profile_id
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.user_balanceops(pagination=pagination)
+            return self.user_balanceops(
+                pagination=pagination,
+                ops_types=ops_types,
+                vault_profile_id=vault_profile_id,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return self._get("user_balanceops", request_params, next_page_func)
 
     def history(
         self,
         *,
+        pagination: Optional[PaginationQuery] = None,
         vault_profile_id: int,
         type: Literal["share_price", "nav"] = "nav",
         range: Literal["1h", "1d", "1w", "1m", "1y", "all"] = "1d",
+        cache: bool = True,
     ) -> MultipleResponse:
         """Get history of a vault
 
+        Responses are cached for ``HISTORY_CACHE_TTL`` seconds.
+
         :param vault_profile_id: Vault profile ID (required)
         :param type: Type of history to get (optional), default is 'nav' ['share_price', 'nav']
         :param range: Range of history to get (optional), default is '1d' ['1h', '1d', '1w', '1m', '1y', 'all']
+        :param cache: Return a cached response if there is one (optional), default is True
         :return: History of a vault in timeseries format
         :rtype: MultipleResponse
 
@@ -251,24 +364,20 @@ class Vaults:
             ]
         """
 
-        request_params = {}
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-        if type:
-            request_params["type"] = type
-        if range:
-            request_params["range"] = range
-
-        response = self.transport.get(
-            "/vaults/history",
-            params=request_params if request_params else None,
+        request_params = _request_params(
+            pagination, vault_profile_id=vault_profile_id, type=type, range=range
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.history(pagination=pagination)
+            return self.history(
+                pagination=pagination,
+                vault_profile_id=vault_profile_id,
+                type=type,
+                range=range,
+                cache=cache,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return self._get("history", request_params, next_page_func, cache)
 
     def fills(
         self,
@@ -309,26 +418,22 @@ class Vaults:
             ]
         """
 
-        request_params = dict(pagination)
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-        if start_time:
-            request_params["start_time"] = (
-                start_time * 1000000
-            )  # convert to microseconds
-        if end_time:
-            request_params["end_time"] = end_time * 1000000  # convert to microseconds
-
-        response = self.transport.get(
-            "/vaults/fills",
-            params=request_params,
+        request_params = _request_params(
+            pagination,
+            vault_profile_id=vault_profile_id,
+            start_time=start_time and start_time * MICROSECONDS,
+            end_time=end_time and end_time * MICROSECONDS,
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.fills(pagination=pagination)
+            return self.fills(
+                pagination=pagination,
+                vault_profile_id=vault_profile_id,
+                start_time=start_time,
+                end_time=end_time,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return self._get("fills", request_params, next_page_func)
 
     def funding(
         self,
@@ -368,44 +473,101 @@ class Vaults:
             ]
         """
 
-        request_params = dict(pagination)
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-        if start_time:
-            request_params["start_time"] = (
-                start_time * 1000000
-            )  # convert to microseconds
-        if end_time:
-            request_params["end_time"] = end_time * 1000000  # convert to microseconds
-
-        response = self.transport.get(
-            "/vaults/funding",
-            params=request_params,
+        request_params = _request_params(
+            pagination,
+            vault_profile_id=vault_profile_id,
+            start_time=start_time and start_time * MICROSECONDS,
+            end_time=end_time and end_time * MICROSECONDS,
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.funding(pagination=pagination)
+            return self.funding(
+                pagination=pagination,
+                vault_profile_id=vault_profile_id,
+                start_time=start_time,
+                end_time=end_time,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return self._get("funding", request_params, next_page_func)
+
+    def snapshot(self, vault_profile_id: int) -> Dict[str, MultipleResponse]:
+        """Get list, holdings, history, fills and funding of a vault concurrently
+
+        The requests run on worker threads and share the pooled connections
+        of the transport client (multiplexed over one HTTP/2 connection when
+        the ``h2`` package is installed).
+
+        :param vault_profile_id: Vault profile ID (required)
+        :type vault_profile_id: int
+        :return: Responses keyed by method name ('list', 'holdings', 'history', 'fills', 'funding')
+        :rtype: Dict[str, MultipleResponse]
+
+        Example:
+
+        .. code-block:: python
+
+            snapshot = rabbitx.vaults.snapshot(89477)
+            print(snapshot["holdings"].result())
+        """
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = {
+                "list": executor.submit(self.list),
+                "holdings": executor.submit(
+                    self.holdings, vault_profile_id=vault_profile_id
+                ),
+                "history": executor.submit(
+                    self.history, vault_profile_id=vault_profile_id
+                ),
+                "fills": executor.submit(self.fills, vault_profile_id=vault_profile_id),
+                "funding": executor.submit(
+                    self.funding, vault_profile_id=vault_profile_id
+                ),
+            }
+        return {name: future.result() for name, future in futures.items()}
 
 
 class AsyncVaults:
     __doc__ = Vaults.__doc__
 
+    __slots__ = ("transport", "_cache", "_inflight")
+
     def __init__(self, transport: AsyncTransport):
         self.transport = transport
+        self._cache = _TTLCache()
+        self._inflight = {}
 
-    async def list(
-        self, *, pagination: Optional[PaginationQuery] = None
+    async def _get(
+        self, name: str, params: dict, next_page_func, cache: bool = True
     ) -> MultipleResponse:
-        response = await self.transport.get("/vaults", params=pagination)
-        response.raise_for_status()
+        endpoint, ttl = _ENDPOINTS[name]
+        key = _TTLCache.key(endpoint, params)
+        if ttl and cache:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        # identical requests issued concurrently share one HTTP round trip
+        request = self._inflight.get(key)
+        if request is None:
+            request = asyncio.ensure_future(self.transport.get(endpoint, params=params))
+            self._inflight[key] = request
+            request.add_done_callback(lambda _: self._inflight.pop(key, None))
+        response = await asyncio.shield(request)
+
+        result = _parse(response, next_page_func)
+        if ttl:
+            self._cache.set(key, result, ttl)
+        return result
 
+    async def list(
+        self, *, pagination: Optional[PaginationQuery] = None, cache: bool = True
+    ) -> MultipleResponse:
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.list(pagination=pagination)
+            return self.list(pagination=pagination, cache=cache)
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return await self._get(
+            "list", _request_params(pagination), next_page_func, cache
+        )
 
     list.__doc__ = Vaults.list.__doc__
 
@@ -415,45 +577,36 @@ class AsyncVaults:
         pagination: Optional[PaginationQuery] = None,
         vault_profile_id: int = None,
     ) -> MultipleResponse:
-        request_params = dict(pagination)
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-
-        response = await self.transport.get(
-            "/vaults/holdings",
-            params=request_params,
-        )
-        response.raise_for_status()
+        request_params = _request_params(pagination, vault_profile_id=vault_profile_id)
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.holdings(pagination=pagination)
+            return self.holdings(
+                pagination=pagination, vault_profile_id=vault_profile_id
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return await self._get("holdings", request_params, next_page_func)
 
     holdings.__doc__ = Vaults.holdings.__doc__
 
     async def all_balanceops(
         self,
         *,
+        pagination: Optional[PaginationQuery] = None,
         ops_types: List[str],
         vault_profile_id: int = None,
     ) -> MultipleResponse:
-        request_params = {}
-        if ops_types:
-            request_params["ops_type"] = ops_types
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-
-        response = await self.transport.get(
-            "/vaults/all-balanceops",
-            params=request_params if request_params else None,
+        request_params = _request_params(
+            pagination, ops_type=ops_types, vault_profile_id=vault_profile_id
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.all_balanceops(pagination=pagination)
+            return self.all_balanceops(
+                pagination=pagination,
+                ops_types=ops_types,
+                vault_profile_id=vault_profile_id,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return await self._get("all_balanceops", request_params, next_page_func)
 
     all_balanceops.__doc__ = Vaults.all_balanceops.__doc__
 
@@ -464,22 +617,18 @@ class AsyncVaults:
         ops_types: List[str],
         vault_profile_id: int = None,
     ) -> MultipleResponse:
-        request_params = dict(pagination)
-        if ops_types:
-            request_params["ops_type"] = ops_types
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-
-        response = await self.transport.get(
-            "/vaults/balanceops",
-            params=request_params,
+        request_params = _request_params(
+            pagination, ops_type=ops_types, vault_profile_id=vault_profile_id
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.user_balanceops(pagination=pagination)
+            return self.user_balanceops(
+                pagination=pagination,
+                ops_types=ops_types,
+                vault_profile_id=vault_profile_id,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return await self._get("user_balanceops", request_params, next_page_func)
 
     user_balanceops.__doc__ = Vaults.user_balanceops.__doc__
 
@@ -490,25 +639,22 @@ class AsyncVaults:
         vault_profile_id: int,
         type: Literal["share_price", "nav"] = "nav",
         range: Literal["1h", "1d", "1w", "1m", "1y", "all"] = "1d",
+        cache: bool = True,
     ) -> MultipleResponse:
-        request_params = dict(pagination)
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-        if type:
-            request_params["type"] = type
-        if range:
-            request_params["range"] = range
-
-        response = await self.transport.get(
-            "/vaults/history",
-            params={"vault_profile_id": vault_profile_id, "type": type, "range": range},
+        request_params = _request_params(
+            pagination, vault_profile_id=vault_profile_id, type=type, range=range
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.history(pagination=pagination)
+            return self.history(
+                pagination=pagination,
+                vault_profile_id=vault_profile_id,
+                type=type,
+                range=range,
+                cache=cache,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return await self._get("history", request_params, next_page_func, cache)
 
     history.__doc__ = Vaults.history.__doc__
 
@@ -520,26 +666,22 @@ class AsyncVaults:
         start_time: int = None,
         end_time: int = None,
     ) -> MultipleResponse:
-        request_params = dict(pagination)
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-        if start_time:
-            request_params["start_time"] = (
-                start_time * 1000000
-            )  # convert to microseconds
-        if end_time:
-            request_params["end_time"] = end_time * 1000000  # convert to microseconds
-
-        response = await self.transport.get(
-            "/vaults/fills",
-            params=request_params,
+        request_params = _request_params(
+            pagination,
+            vault_profile_id=vault_profile_id,
+            start_time=start_time and start_time * MICROSECONDS,
+            end_time=end_time and end_time * MICROSECONDS,
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.fills(pagination=pagination)
+            return self.fills(
+                pagination=pagination,
+                vault_profile_id=vault_profile_id,
+                start_time=start_time,
+                end_time=end_time,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return await self._get("fills", request_params, next_page_func)
 
     fills.__doc__ = Vaults.fills.__doc__
 
@@ -551,25 +693,53 @@ class AsyncVaults:
         start_time: int = None,
         end_time: int = None,
     ) -> MultipleResponse:
-        request_params = dict(pagination)
-        if vault_profile_id:
-            request_params["vault_profile_id"] = vault_profile_id
-        if start_time:
-            request_params["start_time"] = (
-                start_time * 1000000
-            )  # convert to microseconds
-        if end_time:
-            request_params["end_time"] = end_time * 1000000  # convert to microseconds
-
-        response = await self.transport.get(
-            "/vaults/funding",
-            params=request_params,
+        request_params = _request_params(
+            pagination,
+            vault_profile_id=vault_profile_id,
+            start_time=start_time and start_time * MICROSECONDS,
+            end_time=end_time and end_time * MICROSECONDS,
         )
-        response.raise_for_status()
 
         def next_page_func(pagination: PaginationQuery) -> MultipleResponse:
-            return self.funding(pagination=pagination)
+            return self.funding(
+                pagination=pagination,
+                vault_profile_id=vault_profile_id,
+                start_time=start_time,
+                end_time=end_time,
+            )
 
-        return multiple_or_fail(response.json(), next_page_func)
+        return await self._get("funding", request_params, next_page_func)
 
     funding.__doc__ = Vaults.funding.__doc__
+
+    async def snapshot(self, vault_profile_id: int) -> Dict[str, MultipleResponse]:
+        """Get list, holdings, history, fills and funding of a vault concurrently
+
+        All requests are dispatched at once through the shared ``AsyncClient``
+        of the transport, so they reuse its connection pool (one multiplexed
+        HTTP/2 connection when the ``h2`` package is installed) instead of
+        waiting for each other. Use the client as an async context manager so
+        that the pool stays open between calls.
+
+        :param vault_profile_id: Vault profile ID (required)
+        :type vault_profile_id: int
+        :return: Responses keyed by method name ('list', 'holdings', 'history', 'fills', 'funding')
+        :rtype: Dict[str, MultipleResponse]
+
+        Example:
+
+        .. code-block:: python
+
+            async with AsyncRabbitX(...) as rabbitx:
+                snapshot = await rabbitx.vaults.snapshot(89477)
+                print(snapshot["holdings"].result())
+        """
+        names = ("list", "holdings", "history", "fills", "funding")
+        responses = await asyncio.gather(
+            self.list(),
+            self.holdings(vault_profile_id=vault_profile_id),
+            self.history(vault_profile_id=vault_profile_id),
+            self.fills(vault_profile_id=vault_profile_id),
+            self.funding(vault_profile_id=vault_profile_id),
+        )
+        return dict(zip(names, responses))
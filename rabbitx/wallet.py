@@ -1,4 +1,5 @@
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
 from .xutils import read_file
 
 Account.enable_unaudited_hdwallet_features()
@@ -14,8 +15,21 @@ class Wallet:
         The private key
     """
 
+    __slots__ = ("private_key", "_account", "_address")
+
     def __init__(self, private_key: str):
         self.private_key = private_key
+        self._account = None
+        self._address = None
+
+    @property
+    def account(self) -> LocalAccount:
+        """
+        The eth_account account of the private key, decoded once and reused.
+        """
+        if self._account is None:
+            self._account = Account.from_key(self.private_key)
+        return self._account
 
     @staticmethod
     def from_file(private_key_path: str) -> "Wallet":
@@ -64,4 +78,6 @@ class Wallet:
         :return: The wallet address
         :rtype: str
         """
-        return Account.from_key(self.private_key).address
+        if self._address is None:
+            self._address = self.account.address
+        return self._address
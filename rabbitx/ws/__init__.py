@@ -1,4 +1,4 @@
-from .ws import WS
+from .ws import WS, TooManyPendingRequests
 from .channel_handler import ChannelHandler, AsyncChannelHandler
 from .async_ws import AsyncWS
 from .opened_orders import OpenedOrders
@@ -7,11 +7,11 @@ from .positions import Positions
 
 __all__ = [
     "WS",
+    "TooManyPendingRequests",
     "AsyncWS",
     "ChannelHandler",
     "AsyncChannelHandler",
     "OpenedOrders",
     "Orderbook",
-    "OpenedOrders",
     "Positions",
 ]
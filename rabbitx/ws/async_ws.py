@@ -1,20 +1,23 @@
 from .channel_handler import AsyncChannelHandler
-from rabbitx.xutils import dict_get_path, dict_has_path
-from rabbitx import consts
-from typing import Callable
+from rabbitx import consts, xjson
+from typing import Callable, Optional, Union
 from websockets.exceptions import ConnectionClosedOK
 from websockets.asyncio.client import connect
-import json
 import logging
 import os
 import ssl
+import sys
 import asyncio
+from contextlib import asynccontextmanager
 
 DEBUG = os.getenv("DEBUG", False)
 if DEBUG:
     logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("rabbitx.async_ws")
 
+READ_QUEUE_SIZE = 1024  # frames buffered between the reader and the processor
+HEARTBEAT = b"{}"  # ping from the server, echoed back as pong
+
 
 class AsyncWS:
     """
@@ -66,7 +69,10 @@ class AsyncWS:
         self.on_subscribe = on_subscribe
         self.token = token
         self.message_id = 0
+        # callbacks (or futures) of pending requests by message id
         self.promises = {}
+        # frames collected inside _coalesce()
+        self._send_buffer = None
         self.channels = channels
         self.subscribed = {}
         self.authorized = False
@@ -79,7 +85,8 @@ class AsyncWS:
             ssl_context.verify_mode = ssl.CERT_NONE
             self.connection_params.update({"ssl": ssl_context})
         self._websocket_task = None
-        self._stop_event = asyncio.Event()
+        # created on first use, so that it binds to the running event loop
+        self._stop_event = None
 
     def register_handler(self, channel: str, handler: AsyncChannelHandler):
         """
@@ -117,6 +124,7 @@ class AsyncWS:
         :param handler: The handler to register
         :type handler: AsyncChannelHandler
         """
+        channel = sys.intern(channel)
         if channel not in self.handlers:
             self.handlers[channel] = []
         self.handlers[channel].append(handler)
@@ -131,8 +139,7 @@ class AsyncWS:
         """
         try:
             self.conn = await connect(self.url, **self.connection_params)
-            if DEBUG:
-                logger.debug("Connected to %s", self.url)
+            logger.debug("Connected to %s", self.url)
             self.connected = True
             if self.token:
                 await self._authorize()
@@ -148,33 +155,77 @@ class AsyncWS:
             await self.conn.close()
             self.conn = None
 
+        # responses to pending requests won't arrive anymore
+        for promise in self.promises.values():
+            if isinstance(promise, asyncio.Future):
+                promise.cancel()
+        self.promises.clear()
+
         self.authorized = False
         self.connected = False
 
-    async def send(self, message: str):
+    async def send(self, message: Union[str, bytes]):
         """
         Send a message to the WebSocket server.
 
-        :param message: The raw message to send (json string)
-        :type message: str
+        :param message: The raw message to send (json string, bytes are sent as a text frame too)
+        :type message: str | bytes
         """
-        await self.conn.send(message)
+        if self._send_buffer is not None:
+            self._send_buffer.append(
+                message if isinstance(message, bytes) else message.encode()
+            )
+            return
+        await self.conn.send(message, text=True)
+
+    @asynccontextmanager
+    async def _coalesce(self):
+        """Send the messages of the block as a single newline separated frame"""
+        self._send_buffer = []
+        try:
+            yield
+            frames = self._send_buffer
+        finally:
+            self._send_buffer = None
+        if frames:
+            await self.send(b"\n".join(frames))
 
-    async def request(self, message: dict, callback: Callable[[dict], asyncio.Future]):
+    async def request(
+        self, message: dict, callback: Callable[[dict], asyncio.Future] = None
+    ) -> Optional[dict]:
         """
-        Send a message to the WebSocket server with a callback function
-        which will be called when the message is received.
-        The callback function will be called with the received message as an argument.
+        Send a message to the WebSocket server and get its response.
+
+        Without a callback the method waits for the response and returns it.
+        With a callback it returns right after sending and the callback will be
+        called with the response as an argument once it's received.
+
+        Callbacks and handlers must use the callback form: the response is
+        dispatched by the same loop which runs them, so awaiting it there
+        would never finish.
+
+        Example:
+
+        .. code-block:: python
+
+            response = await ws.request({"subscribe": {"channel": "orderbook:BTC-USD"}})
 
         :param message: The message to send (json object)
         :type message: dict
-        :param callback: The callback function to call when the message is received (eg. async callback(message))
+        :param callback: The callback function to call when the message is received (eg. async callback(message)) (optional)
         :type callback: Callable[[dict], asyncio.Future]
+        :return: The response if no callback is given, None otherwise
+        :rtype: dict | None
         """
+        future = None
+        if callback is None:
+            future = asyncio.get_running_loop().create_future()
         self.message_id += 1
-        self.promises[self.message_id] = callback
+        self.promises[self.message_id] = callback or future
         message.update({"id": self.message_id})
-        await self.send(json.dumps(message))
+        await self.send(xjson.dumps(message))
+        if future is not None:
+            return await future
 
     async def _authorize(self):
         """
@@ -187,11 +238,11 @@ class AsyncWS:
         """
 
         async def on_authorized(_):
-            if DEBUG:
-                logger.debug("Authorized")
+            logger.debug("Authorized")
             self.authorized = True
-            for channel in self.channels:
-                await self.subscribe(channel)
+            async with self._coalesce():
+                for channel in self.channels:
+                    await self.subscribe(channel)
 
         await self.request(
             {"connect": {"token": self.token, "name": "js"}}, on_authorized
@@ -253,14 +304,14 @@ class AsyncWS:
         :param channel: The channel to subscribe to
         :type channel: str
         """
+        channel = sys.intern(channel)
 
         if not self.connected and channel not in self.channels:
             self.channels.append(channel)
             return
 
         async def on_subscribe(msg):
-            if DEBUG:
-                logger.debug("Subscribed to %s", channel)
+            logger.debug("Subscribed to %s", channel)
             self.subscribed[channel] = True
             data = msg["subscribe"]["data"]
             await self._handle_subscribe(channel, data)
@@ -274,97 +325,169 @@ class AsyncWS:
 
     async def _handle_message(self, channel: str, data: dict):
         """Handle an incoming message from a channel"""
-        if DEBUG:
-            logger.debug(f"handle_message {channel} {data}")
-        if self.on_message:
+        logger.debug("handle_message %s %s", channel, data)
+        on_message = self.on_message
+        if on_message:
             try:
-                await self.on_message(channel, data)
+                await on_message(channel, data)
             except Exception as e:
-                logger.error(f"Error in on_message callback: {e}")
-        if channel in self.handlers:
-            for handler in self.handlers[channel]:
-                try:
-                    await handler.on_data(data)
-                except Exception as e:
-                    logger.error(
-                        f"Error in handler {handler.__class__.__name__}.on_data: {e}"
-                    )
+                logger.error("Error in on_message callback: %s", e)
+        handlers = self.handlers.get(channel)
+        if handlers:
+            await self._call_handlers(handlers, "on_data", data)
 
     async def _handle_subscribe(self, channel: str, data: dict):
         """Handle a subscription confirmation"""
-        if DEBUG:
-            logger.debug(f"handle_subscribe {channel} {data}")
-        if self.on_subscribe:
+        logger.debug("handle_subscribe %s %s", channel, data)
+        on_subscribe = self.on_subscribe
+        if on_subscribe:
             try:
-                await self.on_subscribe(channel, data)
+                await on_subscribe(channel, data)
             except Exception as e:
-                logger.error(f"Error in on_subscribe callback: {e}")
-        if channel in self.handlers:
-            for handler in self.handlers[channel]:
-                try:
-                    await handler.on_subscribe(data)
-                except Exception as e:
-                    logger.error(
-                        f"Error in handler {handler.__class__.__name__}.on_subscribe: {e}"
-                    )
-
-    async def _process_message(self, message: str):
+                logger.error("Error in on_subscribe callback: %s", e)
+        handlers = self.handlers.get(channel)
+        if handlers:
+            await self._call_handlers(handlers, "on_subscribe", data)
+
+    @staticmethod
+    async def _call_handler(handler: AsyncChannelHandler, method: str, data: dict):
+        try:
+            await getattr(handler, method)(data)
+        except Exception as e:
+            logger.error(
+                "Error in handler %s.%s: %s", handler.__class__.__name__, method, e
+            )
+
+    async def _call_handlers(
+        self, handlers: list[AsyncChannelHandler], method: str, data: dict
+    ):
+        """Call the handlers of a channel, concurrently when there are several"""
+        if len(handlers) == 1:
+            await self._call_handler(handlers[0], method, data)
+            return
+        await asyncio.gather(
+            *(self._call_handler(handler, method, data) for handler in handlers)
+        )
+
+    def _pop_promise(
+        self, msg_id: int
+    ) -> Union[Callable[[dict], asyncio.Future], asyncio.Future, None]:
+        """Take the callback or future of a pending request, if there is one"""
+        if not isinstance(msg_id, int):
+            return None
+        return self.promises.pop(msg_id, None)
+
+    async def _process_message(self, message: bytes):
         """
         Process a message received from the WebSocket server.
 
-        :param message: The raw message received from the WebSocket server (json string)
-        :type message: str
+        :param message: The raw message received from the WebSocket server (json)
+        :type message: bytes
         """
-        msg = json.loads(message)
+        if message == HEARTBEAT:
+            # heartbeat, also when batched with other messages in one frame
+            await self.send(HEARTBEAT)
+            return
+
+        msg = xjson.loads(message)
+
+        msg_id = msg.get("id")
+        if msg_id is not None:
+            promise = self._pop_promise(msg_id)
+            if isinstance(promise, asyncio.Future):
+                if not promise.done():
+                    promise.set_result(msg)
+                return
+            if promise is not None:
+                await promise(msg)
+                return
+
+        channel = msg.get("channel")
+        if channel is None:
+            return
+        # interned like the registered channels, so handler lookups match by identity
+        channel = sys.intern(channel)
 
-        if dict_has_path(msg, "id") and msg["id"] in self.promises:
-            callback = self.promises[msg["id"]]
-            del self.promises[msg["id"]]
-            await callback(msg)
+        data = msg.get("data")
+        if data is not None:
+            await self._handle_message(channel, data)
             return
 
-        if dict_has_path(msg, "channel"):
-            channel = dict_get_path(msg, "channel")
-            if dict_has_path(msg, "data"):
-                data = dict_get_path(msg, "data")
-                await self._handle_message(channel, data)
-            elif dict_has_path(msg, "subscribe"):
-                data = dict_get_path(msg, "subscribe")
-                await self._handle_subscribe(channel, data)
+        data = msg.get("subscribe")
+        if data is not None:
+            await self._handle_subscribe(channel, data)
+
+    async def _read(self, queue: asyncio.Queue):
+        """
+        Receive frames into the queue until the connection is closed.
+
+        A ``None`` is queued at the end to tell the consumer to stop.
+        """
+        try:
+            while True:
+                # raw frames: the json parser takes bytes, no utf-8 decode pass
+                await queue.put(await self.conn.recv(decode=False))
+        except ConnectionClosedOK as e:
+            logger.error("Connection closed: %s", e)
+        except Exception as e:
+            logger.error("Error in WebSocket: %s", e)
+        await queue.put(None)
+
+    async def _handle_frame(self, message: bytes):
+        """Handle a raw frame, which can carry several newline separated messages"""
+        logger.debug("Received message: %s", message)
+
+        if b"\n" in message:
+            # splitlines() also drops the \r of \r\n separated messages
+            for msg in message.splitlines():
+                if msg:
+                    await self._process_message(msg)
+        else:
+            await self._process_message(message)
+
+    def _get_stop_event(self) -> asyncio.Event:
+        if self._stop_event is None:
+            self._stop_event = asyncio.Event()
+        return self._stop_event
 
     async def _run(self):
+        reader = None
+        stop = asyncio.ensure_future(self._get_stop_event().wait())
         try:
             logger.debug("Attempting to connect to WebSocket...")
             await self._connect()
             logger.debug("WebSocket connected successfully")
 
-            while not self._stop_event.is_set():
-                try:
-                    message = await asyncio.wait_for(self.conn.recv(), timeout=1)
-                except asyncio.TimeoutError:
-                    continue
-                except ConnectionClosedOK as e:
-                    logger.error("Connection closed: %s", e)
-                    break
-
-                if DEBUG:
-                    logger.debug("Received message: %s", message)
-
-                if message == "{}":
-                    await self.send("{}")
-                    continue
-
-                if "\n" in message:
-                    for msg in message.split("\n"):
-                        if msg.strip() == "":
-                            continue
-                        await self._process_message(msg)
-                else:
-                    await self._process_message(message)
+            # a dedicated reader task fills the queue, so frames that arrive
+            # in a burst are drained and processed together
+            queue = asyncio.Queue(maxsize=READ_QUEUE_SIZE)
+            reader = asyncio.create_task(self._read(queue))
+
+            while True:
+                # sleep until a frame arrives or stop() is called, no polling
+                get = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {get, stop}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if stop in done:
+                    get.cancel()
+                    return
+
+                batch = [get.result()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                for message in batch:
+                    if message is None:
+                        return
+                    await self._handle_frame(message)
 
         except Exception as e:
             logger.error("Error in WebSocket: %s", e)
         finally:
+            stop.cancel()
+            if reader is not None:
+                reader.cancel()
             await self._disconnect()
 
     async def start(self):
@@ -374,7 +497,7 @@ class AsyncWS:
 
     async def stop(self):
         """Cancel the WebSocket connection task"""
-        self._stop_event.set()
+        self._get_stop_event().set()
         if self.conn:
             try:
                 await self._disconnect()
@@ -17,6 +17,8 @@ class ChannelHandler:
 
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         """
         Initialize the ChannelHandler
@@ -63,6 +65,8 @@ class AsyncChannelHandler:
                     await initialize_something(...)
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         """
         Initialize the AsyncChannelHandler
@@ -1,11 +1,15 @@
 from typing import Callable, Union
 from .channel_handler import ChannelHandler
 
+_CLOSED = frozenset(("closed", "rejected", "canceled", "canceling"))
+
 
 class OpenedOrders(ChannelHandler):
     orders: dict
     on_update: Callable
 
+    __slots__ = ("orders", "on_update")
+
     def __init__(self, on_update: Callable[[str, dict], None] = None):
         """
         OpenOrders is a class that represents the open orders for a given market.
@@ -34,35 +38,24 @@ class OpenedOrders(ChannelHandler):
             if "market_id" not in order or "id" not in order:
                 continue
 
-            market_id = order["market_id"]
-            order_id = order["id"]
-
-            if market_id not in self.orders:
-                self.orders[market_id] = {}
-
-            if order_id not in self.orders[market_id]:
-                self.orders[market_id][order_id] = order
+            key = (order["market_id"], order["id"])
 
-            if order["status"] in ["closed", "rejected", "canceled", "canceling"]:
-                del self.orders[market_id][order_id]
+            if order.get("status") in _CLOSED:
+                self.orders.pop(key, None)
             else:
-                self.orders[market_id][order_id] = order
+                self.orders[key] = order
 
             if self.on_update:
                 self.on_update(order)
 
-    def get_orders(self) -> dict:
+    def get_orders(self) -> list:
         """
         Get all orders
 
         :return: A list of orders
         :rtype: list[dict]
         """
-        orders = []
-        for market_id in self.orders:
-            for order_id in self.orders[market_id]:
-                orders.append(self.orders[market_id][order_id])
-        return orders
+        return list(self.orders.values())
 
     def get_order(self, market_id: str, order_id: str) -> Union[dict, None]:
         """
@@ -76,7 +69,7 @@ class OpenedOrders(ChannelHandler):
         :rtype: dict | None
         """
 
-        return self.orders.get(market_id, {}).get(order_id, None)
+        return self.orders.get((market_id, order_id))
 
     def on_subscribe(self, data: dict):
         self.consume(data)
@@ -1,16 +1,21 @@
-from BTrees.OOBTree import OOBTree as BTree
-from typing import Callable, Union
+from sortedcontainers import SortedDict
+from typing import Callable, List, Optional, Tuple, Union
 from .channel_handler import ChannelHandler
 from decimal import Decimal
 
 zero = Decimal("0")
 
+Level = Tuple[Decimal, Decimal]
+
 
 class Orderbook(ChannelHandler):
+    __slots__ = ("orderbook", "market_id", "on_update", "on_update_batch")
+
     def __init__(
         self,
         market_id: str,
         on_update: Callable[[str, str, Decimal, Decimal], None] = None,
+        on_update_batch: Callable[[str, List[Level], List[Level]], None] = None,
     ):
         """
         Orderbook is a class that represents the orderbook for a given market.
@@ -21,13 +26,16 @@ class Orderbook(ChannelHandler):
         :type market_id: str
         :param on_update: A callback function that is called when the orderbook is updated. on_update(market_id, side, price, amount)
         :type on_update: Callable[[str, str, Decimal, Decimal], None]
+        :param on_update_batch: A callback function that is called once per consumed message with all the updated levels. on_update_batch(market_id, asks, bids) where asks and bids are lists of (price, amount)
+        :type on_update_batch: Callable[[str, List[Tuple[Decimal, Decimal]], List[Tuple[Decimal, Decimal]]], None]
         """
         self.orderbook = {
-            "asks": BTree(),
-            "bids": BTree(),
+            "asks": SortedDict(),
+            "bids": SortedDict(),
         }
         self.market_id = market_id
         self.on_update = on_update
+        self.on_update_batch = on_update_batch
 
         super().__init__(name="orderbook:" + market_id)
 
@@ -38,29 +46,37 @@ class Orderbook(ChannelHandler):
         :param data: The data to consume. data['asks'] and data['bids'] are lists of [price, amount].
         :type data: dict
         """
+        batch = self.on_update_batch is not None
+        asks = [] if batch else None
+        bids = [] if batch else None
+
         if "asks" in data:
-            for price, amount in data["asks"]:
-                price = Decimal(price)
-                amount = Decimal(amount)
-                self.orderbook["asks"].update({price: amount})
-                if amount == zero:
-                    self.orderbook["asks"].pop(price)
-                if self.on_update:
-                    self.on_update(
-                        self.market_id, "short", Decimal(price), Decimal(amount)
-                    )
+            self._apply(self.orderbook["asks"], data["asks"], "short", asks)
 
         if "bids" in data:
-            for price, amount in data["bids"]:
-                price = Decimal(price)
-                amount = Decimal(amount)
-                self.orderbook["bids"].update({price: amount})
-                if amount == zero:
-                    self.orderbook["bids"].pop(price)
-                if self.on_update:
-                    self.on_update(
-                        self.market_id, "long", Decimal(price), Decimal(amount)
-                    )
+            self._apply(self.orderbook["bids"], data["bids"], "long", bids)
+
+        if batch and (asks or bids):
+            self.on_update_batch(self.market_id, asks, bids)
+
+    def _apply(
+        self,
+        book: SortedDict,
+        levels: list,
+        side: str,
+        updates: Optional[List[Level]],
+    ):
+        for price, amount in levels:
+            price = Decimal(price)
+            amount = Decimal(amount)
+            if amount == zero:
+                book.pop(price, None)
+            else:
+                book[price] = amount
+            if self.on_update:
+                self.on_update(self.market_id, side, price, amount)
+            if updates is not None:
+                updates.append((price, amount))
 
     def best_ask(self) -> Union[float, None]:
         """
@@ -69,9 +85,7 @@ class Orderbook(ChannelHandler):
         :return: The best ask price
         :rtype: float | None
         """
-        return (
-            self.orderbook["asks"].minKey() if len(self.orderbook["asks"]) > 0 else None
-        )
+        return next(iter(self.orderbook["asks"]), None)
 
     def best_bid(self) -> Union[float, None]:
         """
@@ -80,9 +94,7 @@ class Orderbook(ChannelHandler):
         :return: The best bid price
         :rtype: float | None
         """
-        return (
-            self.orderbook["bids"].maxKey() if len(self.orderbook["bids"]) > 0 else None
-        )
+        return next(reversed(self.orderbook["bids"]), None)
 
     def on_subscribe(self, data: dict):
         self.consume(data)
@@ -1,8 +1,17 @@
 from typing import Callable, Union
 from .channel_handler import ChannelHandler
 
+_ZERO_SIZES = frozenset((0, "0", "0.0"))
+
+
+def _is_zero(size) -> bool:
+    # the literal checks skip the float() parse for the common values
+    return size in _ZERO_SIZES or float(size) == 0
+
 
 class Positions(ChannelHandler):
+    __slots__ = ("positions", "on_update")
+
     def __init__(self, on_update: Callable[[str, dict], None] = None):
         """
         Positions is a class that represents the positions for a given market.
@@ -32,9 +41,12 @@ class Positions(ChannelHandler):
             if "market_id" not in position:
                 continue
             market_id = position["market_id"]
-            self.positions[market_id] = position
-            if float(position["size"]) == 0:
-                del self.positions[market_id]
+            # like orders without a status, a position without a size stays open
+            size = position.get("size")
+            if size is not None and _is_zero(size):
+                self.positions.pop(market_id, None)
+            else:
+                self.positions[market_id] = position
             if self.on_update:
                 self.on_update(market_id, position)
 
@@ -1,21 +1,80 @@
 from .channel_handler import ChannelHandler
-from rabbitx.xutils import dict_get_path, dict_has_path
-from typing import Callable
+from typing import Callable, Optional, Tuple, Union
 from websockets.exceptions import ConnectionClosedOK
 from websockets.sync.client import connect
-import json
 import logging
 import os
 import ssl
+import itertools
 import threading
+from types import MappingProxyType
 import queue
-from rabbitx import consts
+from collections import deque
+from contextlib import contextmanager
+from rabbitx import consts, xjson
 
 DEBUG = os.getenv("DEBUG", False)
 if DEBUG:
     logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("rabbitx.ws")
 
+MAX_PENDING_REQUESTS = 4096  # requests waiting for a response at the same time
+HEARTBEAT = b"{}"  # ping from the server, echoed back as pong
+
+
+class TooManyPendingRequests(Exception):
+    """Raised by WS.request when MAX_PENDING_REQUESTS requests await a response"""
+
+
+class _HandlerQueue:
+    """
+    Queue for any number of producer threads and a single consumer thread.
+
+    deque.append and deque.popleft are atomic, so only the consumer's wakeup
+    goes through an Event instead of a lock round trip per item as in
+    queue.Queue. Producers are the recv thread and stop(), which queues a
+    wakeup item from the caller's thread. The clear-after-wait logic in get()
+    assumes there is only one consumer. Same get/get_nowait/put interface,
+    raising queue.Empty.
+    """
+
+    __slots__ = ("_items", "_ready")
+
+    def __init__(self):
+        self._items = deque()
+        self._ready = threading.Event()
+
+    def put(self, item):
+        self._items.append(item)
+        self._ready.set()
+
+    def get_nowait(self):
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise queue.Empty from None
+
+    def drain(self) -> list:
+        """Take all the items which are queued right now"""
+        items = []
+        popleft = self._items.popleft
+        try:
+            while True:
+                items.append(popleft())
+        except IndexError:
+            return items
+
+    def get(self, timeout: float = None):
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+            if not self._ready.wait(timeout):
+                raise queue.Empty
+            # items put after this point set the event again
+            self._ready.clear()
+
 
 class WS:
     """
@@ -49,6 +108,7 @@ class WS:
         on_message: Callable[[str, dict], None] = None,
         on_subscribe: Callable[[str, dict], None] = None,
         ssl_skip_verify: bool = False,
+        cpu_affinity: Optional[Tuple[int, int]] = None,
         **kwargs,
     ):
         """
@@ -66,6 +126,8 @@ class WS:
         :type on_subscribe: Callable[[str, dict], None]
         :param ssl_skip_verify: Whether to skip SSL verification
         :type ssl_skip_verify: bool
+        :param cpu_affinity: CPUs to pin the receiving and the handler threads to, Linux only (eg. (2, 3)) (optional)
+        :type cpu_affinity: tuple[int, int]
         :param kwargs: Additional keyword arguments which will be passed to the websockets.sync.client.connect function
         """
         if not url and not network:
@@ -77,18 +139,37 @@ class WS:
         if network and network not in consts.WS_URL:
             raise ValueError(f"Invalid network: {network}")
 
+        if cpu_affinity is not None:
+            if not hasattr(os, "sched_setaffinity"):
+                raise ValueError("cpu_affinity is not supported on this platform")
+            if len(cpu_affinity) != 2 or not set(cpu_affinity) <= os.sched_getaffinity(
+                0
+            ):
+                raise ValueError(f"Invalid cpu_affinity: {cpu_affinity}")
+
         self.url = url or consts.WS_URL[network]
+        self.cpu_affinity = cpu_affinity
         self.conn = None
         self.on_message = on_message
         self.on_subscribe = on_subscribe
         self.token = token
         self.message_id = 0
+        # next() on a count is atomic, so threads calling request() get unique
+        # ids; ids keep growing across reconnects and are never reused
+        self._message_ids = itertools.count(1)
+        # callbacks of pending requests by message id
         self.promises = {}
+        # (thread id, frames) while that thread is inside _coalesce()
+        self._send_buffer = None
         self.channels = channels
         self.subscribed = {}
         self.authorized = False
         self.connected = False
-        self.handlers = {}
+        self._handlers = {}
+        # bound on_data/on_subscribe methods of the handlers per channel,
+        # rebuilt by (un)register_handler and swapped in atomically for the worker
+        self._data_callbacks = {}
+        self._subscribe_callbacks = {}
         self.connection_params = kwargs
         if ssl_skip_verify:
             ssl_context = ssl.create_default_context()
@@ -97,10 +178,39 @@ class WS:
             self.connection_params.update({"ssl": ssl_context})
         self._websocket_thread = None
         self._websocket_stop_event = threading.Event()
-        self._handler_queue = queue.Queue()
+        self._handler_queue = _HandlerQueue()
         self._handler_thread = None
         self._handler_stop_event = threading.Event()
 
+    @property
+    def handlers(self) -> MappingProxyType:
+        """
+        Registered handlers per channel (read-only).
+
+        Use register_handler and unregister_handler to change them.
+        """
+        return MappingProxyType(self._handlers)
+
+    def _set_handlers(self, channel: str, handlers: tuple):
+        if handlers:
+            self._handlers[channel] = handlers
+        else:
+            self._handlers.pop(channel, None)
+        self._data_callbacks[channel] = tuple(h.on_data for h in handlers)
+        self._subscribe_callbacks[channel] = tuple(h.on_subscribe for h in handlers)
+
+    def unregister_handler(self, channel: str, handler: ChannelHandler):
+        """
+        Remove a handler registered for a channel.
+
+        :param channel: The channel the handler is registered for
+        :type channel: str
+        :param handler: The handler to remove
+        :type handler: ChannelHandler
+        """
+        handlers = self._handlers.get(channel, ())
+        self._set_handlers(channel, tuple(h for h in handlers if h is not handler))
+
     def register_handler(self, channel: str, handler: ChannelHandler):
         """
         Register a handler for a channel.
@@ -135,9 +245,7 @@ class WS:
         :param handler: The handler to register
         :type handler: ChannelHandler
         """
-        if channel not in self.handlers:
-            self.handlers[channel] = []
-        self.handlers[channel].append(handler)
+        self._set_handlers(channel, (*self._handlers.get(channel, ()), handler))
 
         if not self.connected and channel not in self.channels:
             self.channels.append(channel)
@@ -166,17 +274,37 @@ class WS:
             self.conn.close()
             self.conn = None
 
+        # responses to pending requests won't arrive anymore
+        self.promises = {}
         self.authorized = False
         self.connected = False
 
-    def send(self, message: str):
+    def send(self, message: Union[str, bytes]):
         """
         Send a message to the WebSocket server.
 
-        :param message: The raw message to send (json string)
-        :type message: str
+        :param message: The raw message to send (json string, bytes are sent as a text frame too)
+        :type message: str | bytes
         """
-        self.conn.send(message)
+        buffer = self._send_buffer
+        if buffer is not None and buffer[0] == threading.get_ident():
+            buffer[1].append(
+                message if isinstance(message, bytes) else message.encode()
+            )
+            return
+        self.conn.send(message, text=True)
+
+    @contextmanager
+    def _coalesce(self):
+        """Send the messages of the calling thread as a single newline separated frame"""
+        self._send_buffer = (threading.get_ident(), [])
+        try:
+            yield
+            frames = self._send_buffer[1]
+        finally:
+            self._send_buffer = None
+        if frames:
+            self.send(b"\n".join(frames))
 
     def request(self, message: dict, callback: Callable[[dict], None]):
         """
@@ -188,11 +316,16 @@ class WS:
         :type message: dict
         :param callback: The callback function to call when the message is received (eg. callback(message))
         :type callback: Callable[[dict], None]
+        :raises TooManyPendingRequests: if MAX_PENDING_REQUESTS requests are already waiting for a response
         """
-        self.message_id += 1
-        self.promises[self.message_id] = callback
-        message.update({"id": self.message_id})
-        self.send(json.dumps(message))
+        if len(self.promises) >= MAX_PENDING_REQUESTS:
+            raise TooManyPendingRequests(
+                f"{MAX_PENDING_REQUESTS} requests are waiting for a response"
+            )
+        message_id = self.message_id = next(self._message_ids)
+        self.promises[message_id] = callback
+        message.update({"id": message_id})
+        self.send(xjson.dumps(message))
 
     def _authorize(self):
         """
@@ -208,8 +341,9 @@ class WS:
             if DEBUG:
                 logger.debug("Authorized")
             self.authorized = True
-            for channel in self.channels:
-                self.subscribe(channel)
+            with self._coalesce():
+                for channel in self.channels:
+                    self.subscribe(channel)
 
         self.request({"connect": {"token": self.token, "name": "js"}}, on_authorized)
 
@@ -284,80 +418,96 @@ class WS:
             on_subscribe,
         )
 
+    def _stop_handler_worker(self):
+        self._handler_stop_event.set()
+        # unblocks the worker right away, the item itself is ignored
+        self._handler_queue.put(("wakeup", None))
+
     def _handler_worker(self):
         """Worker thread that processes handler callbacks from the queue"""
 
         def handle_message(channel, data):
             if DEBUG:
-                logger.debug(f"handle_message {channel} {data}")
-            if self.on_message:
-                self.on_message(channel, data)
-            if channel in self.handlers:
-                for handler in self.handlers[channel]:
-                    handler.on_data(data)
+                logger.debug("handle_message %s %s", channel, data)
+            on_message = self.on_message
+            if on_message:
+                on_message(channel, data)
+            for callback in self._data_callbacks.get(channel, ()):
+                callback(data)
 
         def handle_subscribe(channel, data):
             if DEBUG:
-                logger.debug(f"handle_subscribe {channel} {data}")
-            if self.on_subscribe:
-                self.on_subscribe(channel, data)
-            if channel in self.handlers:
-                for handler in self.handlers[channel]:
-                    handler.on_subscribe(data)
+                logger.debug("handle_subscribe %s %s", channel, data)
+            on_subscribe = self.on_subscribe
+            if on_subscribe:
+                on_subscribe(channel, data)
+            for callback in self._subscribe_callbacks.get(channel, ()):
+                callback(data)
 
         while not self._handler_stop_event.is_set():
-            try:
-                handler_type, args = self._handler_queue.get(timeout=1)
-                if DEBUG:
-                    logger.debug(f"handler_type {handler_type} args {args}")
-                if handler_type == "message":
-                    channel, data = args
-                    handle_message(channel, data)
-                elif handler_type == "subscribe":
-                    channel, data = args
-                    handle_subscribe(channel, data)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error("Error in handler worker: %s", e)
+            # sleeps until something is queued, stop() queues a wakeup item
+            first = self._handler_queue.get()
+
+            # handle everything that queued up meanwhile within one wakeup
+            for handler_type, args in [first, *self._handler_queue.drain()]:
+                try:
+                    if DEBUG:
+                        logger.debug("handler_type %s args %s", handler_type, args)
+                    if handler_type == "message":
+                        channel, data = args
+                        handle_message(channel, data)
+                    elif handler_type == "subscribe":
+                        channel, data = args
+                        handle_subscribe(channel, data)
+                except Exception as e:
+                    logger.error("Error in handler worker: %s", e)
+
+    def _process_message(self, message: bytes):
+        if message == HEARTBEAT:
+            # heartbeat, also when batched with other messages in one frame
+            self.send(HEARTBEAT)
+            return
 
-    def _process_message(self, message):
         try:
-            msg = json.loads(message)
+            msg = xjson.loads(message)
         except Exception as e:
             logger.error("Error in json.loads(): %s", e)
             return
 
-        if "id" in msg and msg["id"] in self.promises:
-            self.promises[msg["id"]](msg)
-            del self.promises[msg["id"]]
-        elif dict_has_path(msg, "push.channel") and dict_has_path(msg, "push.pub.data"):
-            channel = dict_get_path(msg, "push.channel")
-            data = dict_get_path(msg, "push.pub.data")
-            self._handler_queue.put(("message", (channel, data)))
-        else:
-            logger.error("Received unknown message: %s", msg)
+        msg_id = msg.get("id")
+        if msg_id is not None:
+            callback = self.promises.pop(msg_id, None)
+            if callback is not None:
+                callback(msg)
+                return
+
+        push = msg.get("push")
+        if push is not None:
+            channel = push.get("channel")
+            pub = push.get("pub")
+            if channel is not None and pub is not None and "data" in pub:
+                self._handler_queue.put(("message", (channel, pub["data"])))
+                return
+
+        logger.error("Received unknown message: %s", msg)
 
     def _run(self):
+        # stop() may reset self.conn from another thread while recv() blocks
+        conn = self.conn
         try:
             while not self._websocket_stop_event.is_set():
-                try:
-                    message = self.conn.recv(timeout=1)
-                except TimeoutError:
-                    continue
+                # blocks until a frame arrives, stop() closes the connection to
+                # unblock it; raw frames: the json parser takes bytes, no utf-8 decode pass
+                message = conn.recv(decode=False)
 
                 if DEBUG:
                     logger.debug("Received message: %s", message)
 
-                if message == "{}":
-                    self.send("{}")
-                    continue
-
-                if "\n" in message:
-                    for msg in message.split("\n"):
-                        if msg.strip() == "":
-                            continue
-                        self._process_message(msg)
+                if b"\n" in message:
+                    # splitlines() also drops the \r of \r\n separated messages
+                    for msg in message.splitlines():
+                        if msg:
+                            self._process_message(msg)
                 else:
                     self._process_message(message)
         except ConnectionClosedOK as e:
@@ -367,12 +517,19 @@ class WS:
             logger.error("Error in consume(): %s", e)
             raise
 
+    def _pin_thread(self, index: int):
+        """Pin the calling thread to its CPU from cpu_affinity"""
+        if self.cpu_affinity is not None:
+            # pid 0 means the calling thread here, not the whole process
+            os.sched_setaffinity(0, {self.cpu_affinity[index]})
+
     def start(self):
         """
         Start the WebSocket connection in a separate thread.
         """
 
         def websocket_thread():
+            self._pin_thread(0)
             try:
                 logger.debug("Attempting to connect to WebSocket...")
                 self._connect()
@@ -384,10 +541,12 @@ class WS:
             finally:
                 self._disconnect()
 
+        def handler_thread():
+            self._pin_thread(1)
+            self._handler_worker()
+
         # Start handler thread
-        self._handler_thread = threading.Thread(
-            target=self._handler_worker, daemon=True
-        )
+        self._handler_thread = threading.Thread(target=handler_thread, daemon=True)
         self._handler_thread.start()
 
         # Start WebSocket thread
@@ -399,7 +558,7 @@ class WS:
         Stop the WebSocket connection.
         """
         self._websocket_stop_event.set()
-        self._handler_stop_event.set()
+        self._stop_handler_worker()
         if self.conn:
             try:
                 self._disconnect()
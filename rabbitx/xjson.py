@@ -0,0 +1,28 @@
+"""
+JSON helpers.
+
+orjson is used when it's installed (``pip install python-rabbitx[fast]``),
+the standard library otherwise. Both accept ``bytes`` as well as ``str``,
+so raw response bodies can be passed without decoding them first.
+``dumps`` always returns compact utf-8 ``bytes``.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+loads = orjson.loads if orjson else json.loads
+
+
+# json.dumps() builds a new encoder on every call when separators are given
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _json_dumps(obj) -> bytes:
+    return _encode(obj).encode()
+
+
+dumps = orjson.dumps if orjson else _json_dumps
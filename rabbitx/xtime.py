@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timezone
 
 
@@ -18,4 +19,4 @@ def get_current_timestamp():
     :return: The current timestamp
     :rtype: int
     """
-    return int(get_current_time().timestamp())
+    return int(time.time())
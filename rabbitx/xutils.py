@@ -1,34 +1,62 @@
+import functools
 import hashlib
-from binascii import hexlify, unhexlify
+import hmac
+from operator import itemgetter
 import json
 from pygments import highlight, lexers, formatters
 
 from rabbitx.xtime import get_current_timestamp
 
+_first = itemgetter(0)
+_by_key = itemgetter("key")
+_key_value = itemgetter("key", "value")
+_missing = object()
+_BOOL_STR = {True: "true", False: "false"}
+_JSON_LEXER = lexers.JsonLexer()
+_TERMINAL_FORMATTER = formatters.TerminalFormatter()
+
 
 def new_payload(method: str, endpoint: str, params: dict) -> list:
     """
     Creates a payload dictionary with sorted keys.
 
+    The method and path entries are sorted together with the parameters,
+    so the result can be hashed with :func:`payload_hash_presorted`.
+
     :param method: HTTP method (str, e.g., "POST")
     :type method: str
     :param endpoint: API endpoint path (str, e.g., "/orders")
     :type endpoint: str
     :param params: Dictionary of request parameters
     :type params: dict
-    :return: List of dictionaries representing the payload with sorted keys
+    :return: List of dictionaries representing the payload sorted by key
     :rtype: list
     """
 
-    payload = [
-        {"key": key, "value": str(value).lower() if isinstance(value, bool) else value}
-        for key, value in sorted(params.items())
+    return [
+        {"key": key, "value": value}
+        for key, value in _payload_items(method, endpoint, params)
+    ]
+
+
+def _payload_items(method: str, endpoint: str, params: dict) -> list:
+    # (key, value) pairs of the payload sorted by key, bools as "true"/"false"
+    items = [*params.items(), ("method", method), ("path", endpoint)]
+    return [
+        (key, _BOOL_STR[value] if type(value) is bool else value)
+        for key, value in sorted(items, key=_first)
     ]
-    payload.extend([
-        {"key": "method", "value": method},
-        {"key": "path", "value": endpoint},
+
+
+def _payload_message(timestamp: int, items) -> bytes:
+    # array values are joined with commas and wrapped in double quotes
+    message = "".join([
+        f'{key}=["{",".join(map(str, value))}"]'
+        if isinstance(value, list)
+        else f"{key}={value}"
+        for key, value in items
     ])
-    return payload
+    return (message + str(timestamp)).encode("utf-8")
 
 
 def payload_hash(timestamp: int, payload: list) -> str:
@@ -43,20 +71,22 @@ def payload_hash(timestamp: int, payload: list) -> str:
     :rtype: str
     """
 
-    # Sort payload by key
-    sorted_payload = sorted(payload, key=lambda x: x["key"])
+    return payload_hash_presorted(timestamp, sorted(payload, key=_by_key))
+
 
-    message_parts = []
-    for item in sorted_payload:
-        key, value = item["key"], item["value"]
-        if isinstance(value, list):
-            # Join array values with commas and wrap in double quotes
-            message_parts.append(f'{key}=["{",".join(map(str, value))}"]')
-        else:
-            message_parts.append(f"{key}={value}")
+def payload_hash_presorted(timestamp: int, payload: list) -> str:
+    """
+    Hashes a payload which is already sorted by key (e.g. the result of :func:`new_payload`).
+
+    :param timestamp: Unix timestamp (int)
+    :type timestamp: int
+    :param payload: List of dictionaries representing the payload, sorted by key
+    :type payload: list
+    :return: SHA-256 hash of the formatted payload string
+    :rtype: str
+    """
 
-    message = "".join(message_parts) + str(timestamp)
-    encoded_message = message.encode("utf-8")
+    encoded_message = _payload_message(timestamp, map(_key_value, payload))
     return "0x" + hashlib.sha256(encoded_message).hexdigest()
 
 
@@ -72,17 +102,85 @@ def rbt_signature(payload: str, random_secret: str) -> str:
     :rtype: str
     """
 
-    import hmac
-
     # Convert key and data to bytes if provided as hexadecimal strings
-    key_bytes = unhexlify(
-        random_secret[2:] if random_secret.startswith("0x") else random_secret
-    )
-    data_bytes = unhexlify(payload[2:] if payload.startswith("0x") else payload)
+    key_bytes = bytes.fromhex(random_secret.removeprefix("0x"))
+    data_bytes = bytes.fromhex(payload.removeprefix("0x"))
+
+    # one-shot HMAC, computed by OpenSSL without creating an HMAC object
+    return "0x" + hmac.digest(key_bytes, data_bytes, "sha256").hex()
 
-    # Compute HMAC and convert result to hexadecimal
-    hmac_obj = hmac.new(key_bytes, data_bytes, hashlib.sha256)
-    return "0x" + hexlify(hmac_obj.digest()).decode()
+
+class RbtSigner:
+    """
+    Computes RBT signatures for a fixed secret.
+
+    The secret is decoded and the HMAC keyed once, every signature then
+    starts from a copy of that keyed state. Signatures of requests within the
+    current second are remembered, so retries of the same request don't hash
+    again.
+
+    Attributes
+    ----------
+    random_secret : str
+        API secret key
+    """
+
+    __slots__ = ("random_secret", "_hmac", "_signed", "_signed_timestamp")
+
+    def __init__(self, random_secret: str):
+        self.random_secret = random_secret
+        key_bytes = bytes.fromhex(random_secret.removeprefix("0x"))
+        self._hmac = hmac.new(key_bytes, digestmod=hashlib.sha256)
+        self._signed = {}
+        self._signed_timestamp = None
+
+    def sign(self, payload: str) -> str:
+        """
+        Computes the RBT signature (SHA-256 HMAC) of a hashed payload.
+
+        :param payload: Hashed payload string
+        :type payload: str
+        :return: Hex-encoded HMAC string
+        :rtype: str
+        """
+        h = self._hmac.copy()
+        h.update(bytes.fromhex(payload.removeprefix("0x")))
+        return "0x" + h.hexdigest()
+
+    def sign_request(
+        self, timestamp: int, method: str, endpoint: str, params: dict
+    ) -> str:
+        """
+        Computes the RBT signature of a request in one go.
+
+        Same result as signing the :func:`payload_hash_presorted` of
+        :func:`new_payload`, but the payload hash is passed to the HMAC as raw
+        bytes and no intermediate payload dictionaries are built.
+
+        :param timestamp: Unix timestamp
+        :type timestamp: int
+        :param method: HTTP method (str, e.g., "POST")
+        :type method: str
+        :param endpoint: API endpoint path (str, e.g., "/orders")
+        :type endpoint: str
+        :param params: Dictionary of request parameters
+        :type params: dict
+        :return: Hex-encoded HMAC string
+        :rtype: str
+        """
+        message = _payload_message(timestamp, _payload_items(method, endpoint, params))
+
+        # the message ends with the timestamp, so older entries can't match anymore
+        if timestamp != self._signed_timestamp:
+            self._signed = {}
+            self._signed_timestamp = timestamp
+        signed = self._signed
+        signature = signed.get(message)
+        if signature is None:
+            h = self._hmac.copy()
+            h.update(hashlib.sha256(message).digest())
+            signature = signed[message] = "0x" + h.hexdigest()
+        return signature
 
 
 def create_headers(timestamp: int, rbt_signature: str, jwt: str) -> dict:
@@ -108,6 +206,12 @@ def create_headers(timestamp: int, rbt_signature: str, jwt: str) -> dict:
     return headers
 
 
+@functools.lru_cache(maxsize=16)
+def _rbt_signer(random_secret: str) -> RbtSigner:
+    # one signer per secret, so its keyed HMAC and signature memo are reused
+    return RbtSigner(random_secret)
+
+
 def api_headers(
     method: str, endpoint: str, api_key: str, api_secret: str, json={}
 ) -> dict:
@@ -128,9 +232,9 @@ def api_headers(
     :rtype: dict
     """
     timestamp = get_current_timestamp() + 15
-    payload = new_payload(method.upper(), endpoint, params=json)
-    hashed_payload = payload_hash(timestamp, payload)
-    signature = rbt_signature(hashed_payload, api_secret)
+    signature = _rbt_signer(api_secret).sign_request(
+        timestamp, method.upper(), endpoint, json
+    )
 
     headers = {
         "RBT-TS": str(timestamp),
@@ -165,12 +269,16 @@ def print_json(result, color=True):
     """
     formatted_json = json.dumps(result, indent=4)
     if color:
-        formatted_json = highlight(
-            formatted_json, lexers.JsonLexer(), formatters.TerminalFormatter()
-        )
+        formatted_json = highlight(formatted_json, _JSON_LEXER, _TERMINAL_FORMATTER)
     print(formatted_json)
 
 
+@functools.lru_cache(maxsize=512)
+def _path_keys(path: str) -> tuple:
+    # paths are mostly literals, so they are split once
+    return tuple(path.split("."))
+
+
 def dict_has_path(d: dict, path: str) -> bool:
     """
     Checks if a dictionary has a specific path.
@@ -182,12 +290,10 @@ def dict_has_path(d: dict, path: str) -> bool:
     :return: True if the path exists, False otherwise
     :rtype: bool
     """
-    keys = path.split(".")
     current = d
-    for key in keys:
-        if isinstance(current, dict) and key in current:
-            current = current[key]
-        else:
+    for key in _path_keys(path):
+        current = current.get(key, _missing) if isinstance(current, dict) else _missing
+        if current is _missing:
             return False
     return True
 
@@ -203,11 +309,9 @@ def dict_get_path(d: dict, path: str) -> any:
     :return: The value at the path, or None if the path does not exist
     :rtype: any
     """
-    keys = path.split(".")
     current = d
-    for key in keys:
-        if isinstance(current, dict) and key in current:
-            current = current[key]
-        else:
+    for key in _path_keys(path):
+        if not isinstance(current, dict):
             return None
+        current = current.get(key)
     return current
@@ -13,15 +13,22 @@ root_dir = os.path.dirname(os.path.dirname(__file__))
 
 
 def generate_wallet_file(directory: str):
-    i = 1
+    # continue after the highest existing number, one readdir instead of a stat per wallet
+    numbers = [
+        int(name[6:-3])
+        for name in os.listdir(directory)
+        if name.startswith("wallet") and name.endswith(".pk") and name[6:-3].isdigit()
+    ]
+    i = max(numbers, default=0) + 1
     while True:
-        filename = f"wallet{i}.pk"
-        wallet_file = os.path.join(directory, filename)
-        if not os.path.exists(wallet_file):
-            break
-        i += 1
-
-    return wallet_file
+        wallet_file = os.path.join(directory, f"wallet{i}.pk")
+        try:
+            # O_EXCL claims the name atomically, concurrent runs never share a file
+            os.close(os.open(wallet_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+        except FileExistsError:
+            i += 1
+            continue
+        return wallet_file
 
 
 def generate_wallet():
@@ -0,0 +1,185 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from websockets.exceptions import ConnectionClosedOK
+from rabbitx.ws.async_ws import AsyncWS
+from rabbitx.ws.channel_handler import AsyncChannelHandler
+
+
+@pytest.fixture
+def ws():
+    ws = AsyncWS(token="token", url="wss://example.com/ws")
+    ws.on_message = AsyncMock()
+    ws.on_subscribe = AsyncMock()
+    return ws
+
+
+@pytest.mark.asyncio
+class TestAsyncWS:
+    async def test_process_message_resolves_promise(self, ws: AsyncWS):
+        callback = AsyncMock()
+        ws.message_id = 1
+        ws.promises[1] = callback
+
+        await ws._process_message(b'{"id": 1, "result": {}}')
+
+        callback.assert_awaited_once_with({"id": 1, "result": {}})
+        assert len(ws.promises) == 0
+
+    async def test_promises_resolved_out_of_order(self, ws: AsyncWS):
+        ws.send = AsyncMock()
+        callbacks = [AsyncMock() for _ in range(3)]
+        for callback in callbacks:
+            await ws.request({}, callback)
+
+        await ws._process_message(b'{"id": 2}')
+        assert list(ws.promises) == [1, 3]
+        await ws._process_message(b'{"id": 2}')
+        await ws._process_message(b'{"id": 1}')
+        assert list(ws.promises) == [3]
+        await ws._process_message(b'{"id": 3}')
+
+        for msg_id, callback in enumerate(callbacks, 1):
+            callback.assert_awaited_once_with({"id": msg_id})
+        assert len(ws.promises) == 0
+
+    async def test_dropped_reply_does_not_hold_later_promises(self, ws: AsyncWS):
+        ws.send = AsyncMock()
+        for _ in range(100):
+            await ws.request({}, AsyncMock())
+
+        # the server never answers request 1
+        for msg_id in range(2, 101):
+            await ws._process_message(b'{"id": %d}' % msg_id)
+
+        assert list(ws.promises) == [1]
+
+    async def test_request_returns_response(self, ws: AsyncWS):
+        ws.send = AsyncMock()
+
+        request = asyncio.ensure_future(ws.request({"subscribe": {"channel": "c"}}))
+        await asyncio.sleep(0)
+        await ws._process_message(b'{"id": 1, "subscribe": {"data": {}}}')
+
+        assert await request == {"id": 1, "subscribe": {"data": {}}}
+        assert len(ws.promises) == 0
+
+    async def test_disconnect_cancels_pending_requests(self, ws: AsyncWS):
+        ws.send = AsyncMock()
+
+        request = asyncio.ensure_future(ws.request({"subscribe": {"channel": "c"}}))
+        await asyncio.sleep(0)
+        await ws._disconnect()
+
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        assert len(ws.promises) == 0
+
+    async def test_subscribes_after_authorize_share_a_frame(self, ws: AsyncWS):
+        ws.conn = AsyncMock()
+        ws.channels = ["a", "b"]
+        ws.connected = True
+        await ws._authorize()
+        await ws._process_message(b'{"id": 1, "connect": {}}')
+
+        assert ws.conn.send.await_count == 2
+        ws.conn.send.assert_awaited_with(
+            b'{"subscribe":{"channel":"a"},"id":2}\n'
+            b'{"subscribe":{"channel":"b"},"id":3}',
+            text=True,
+        )
+
+    async def test_heartbeat_in_batched_frame(self, ws: AsyncWS):
+        ws.send = AsyncMock()
+
+        await ws._handle_frame(b'{"channel": "c", "data": 1}\n{}')
+
+        ws.send.assert_awaited_once_with(b"{}")
+        ws.on_message.assert_awaited_once_with("c", 1)
+
+    async def test_process_message_data(self, ws: AsyncWS):
+        await ws._process_message(b'{"channel": "orderbook:BTC-USD", "data": {"a": 1}}')
+
+        ws.on_message.assert_awaited_once_with("orderbook:BTC-USD", {"a": 1})
+        ws.on_subscribe.assert_not_awaited()
+
+    async def test_process_message_subscribe(self, ws: AsyncWS):
+        await ws._process_message(
+            b'{"channel": "orderbook:BTC-USD", "subscribe": {"a": 1}}'
+        )
+
+        ws.on_subscribe.assert_awaited_once_with("orderbook:BTC-USD", {"a": 1})
+        ws.on_message.assert_not_awaited()
+
+    async def test_run_processes_frames_in_order(self, ws: AsyncWS):
+        conn = AsyncMock()
+        conn.recv.side_effect = [
+            b'{"channel": "c", "data": 1}',
+            b'{"channel": "c", "data": 2}\n{"channel": "c", "data": 3}\n',
+            ConnectionClosedOK(None, None),
+        ]
+
+        async def connect():
+            ws.conn = conn
+            ws.connected = True
+
+        ws._connect = connect
+        await ws._run()
+
+        assert [call.args for call in ws.on_message.await_args_list] == [
+            ("c", 1),
+            ("c", 2),
+            ("c", 3),
+        ]
+        conn.close.assert_awaited_once()
+        assert ws.conn is None
+
+    async def test_stop_wakes_idle_run(self, ws: AsyncWS):
+        conn = AsyncMock()
+        conn.recv.side_effect = asyncio.Event().wait  # never receives anything
+
+        async def connect():
+            ws.conn = conn
+            ws.connected = True
+
+        ws._connect = connect
+        run = asyncio.ensure_future(ws._run())
+        await asyncio.sleep(0)
+
+        ws._get_stop_event().set()
+        await asyncio.wait_for(run, timeout=0.5)
+
+        conn.close.assert_awaited_once()
+
+    async def test_handlers_run_concurrently(self, ws: AsyncWS):
+        events = []
+
+        class SlowHandler(AsyncChannelHandler):
+            async def on_data(self, data):
+                await asyncio.sleep(0.01)
+                events.append(self.name)
+
+        class FastHandler(AsyncChannelHandler):
+            async def on_data(self, data):
+                events.append(self.name)
+
+        class FailingHandler(AsyncChannelHandler):
+            async def on_data(self, data):
+                raise RuntimeError("boom")
+
+        ws.register_handler("c", SlowHandler("slow"))
+        ws.register_handler("c", FailingHandler("failing"))
+        ws.register_handler("c", FastHandler("fast"))
+
+        await ws._handle_message("c", {})
+
+        assert events == ["fast", "slow"]
+
+    async def test_request_sends_json_text_frame(self, ws: AsyncWS):
+        ws.conn = AsyncMock()
+
+        await ws.request({"subscribe": {"channel": "c"}}, AsyncMock())
+
+        ws.conn.send.assert_awaited_once_with(
+            b'{"subscribe":{"channel":"c"},"id":1}', text=True
+        )
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+from rabbitx.ws.opened_orders import OpenedOrders
+
+
+def order(order_id: str, status: str = "open", market_id: str = "BTC-USD") -> dict:
+    return {"id": order_id, "market_id": market_id, "status": status}
+
+
+def test_consume():
+    on_update = MagicMock()
+    opened_orders = OpenedOrders(on_update=on_update)
+
+    opened_orders.consume({
+        "orders": [order("1"), order("2"), order("3", market_id="ETH-USD")]
+    })
+    opened_orders.consume({"orders": [order("2", status="canceled")]})
+
+    assert opened_orders.get_orders() == [order("1"), order("3", market_id="ETH-USD")]
+    assert opened_orders.get_order("BTC-USD", "1") == order("1")
+    assert opened_orders.get_order("BTC-USD", "2") is None
+    assert opened_orders.get_order("ETH-USD", "1") is None
+    assert on_update.call_count == 4
+
+
+def test_consume_skips_incomplete_orders():
+    opened_orders = OpenedOrders()
+    opened_orders.consume({"orders": [{"id": "1"}, {"market_id": "BTC-USD"}]})
+    assert opened_orders.get_orders() == []
+
+
+def test_consume_closed_order_never_stored():
+    on_update = MagicMock()
+    opened_orders = OpenedOrders(on_update=on_update)
+
+    opened_orders.consume({"orders": [order("1", status="closed")]})
+
+    assert opened_orders.orders == {}
+    on_update.assert_called_once_with(order("1", status="closed"))
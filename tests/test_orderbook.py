@@ -0,0 +1,42 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+from rabbitx.ws.orderbook import Orderbook
+
+
+def test_best_prices_empty():
+    orderbook = Orderbook("BTC-USD")
+    assert orderbook.best_ask() is None
+    assert orderbook.best_bid() is None
+
+
+def test_consume():
+    on_update = MagicMock()
+    orderbook = Orderbook("BTC-USD", on_update=on_update)
+
+    orderbook.consume({
+        "asks": [["101", "1"], ["100", "2"], ["102", "3"]],
+        "bids": [["99", "1"], ["98", "2"], ["97", "3"]],
+    })
+    assert orderbook.best_ask() == Decimal("100")
+    assert orderbook.best_bid() == Decimal("99")
+
+    orderbook.consume({"asks": [["100", "0"]], "bids": [["99", "0"]]})
+    assert orderbook.best_ask() == Decimal("101")
+    assert orderbook.best_bid() == Decimal("98")
+
+    on_update.assert_called_with("BTC-USD", "long", Decimal("99"), Decimal("0"))
+    assert on_update.call_count == 8
+
+
+def test_consume_batch():
+    on_update_batch = MagicMock()
+    orderbook = Orderbook("BTC-USD", on_update_batch=on_update_batch)
+
+    orderbook.consume({"asks": [["101", "1"], ["100", "2"]], "bids": []})
+    orderbook.consume({})
+
+    on_update_batch.assert_called_once_with(
+        "BTC-USD",
+        [(Decimal("101"), Decimal("1")), (Decimal("100"), Decimal("2"))],
+        [],
+    )
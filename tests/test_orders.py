@@ -32,7 +32,7 @@ def mock_async_transport():
     transport = AsyncMock()
 
     # POST
-    post_response = AsyncMock()
+    post_response = MagicMock()
     post_response.json = MagicMock(
         return_value={"success": True, "result": [{"status": "processing"}]}
     )
@@ -40,13 +40,13 @@ def mock_async_transport():
     transport.post.return_value = post_response
 
     # GET
-    get_response = AsyncMock()
+    get_response = MagicMock()
     get_response.json = MagicMock(return_value={"success": True, "result": []})
     get_response.raise_for_status = MagicMock()
     transport.get.return_value = get_response
 
     # PUT
-    put_response = AsyncMock()
+    put_response = MagicMock()
     put_response.json = MagicMock(
         return_value={"success": True, "result": [{"status": "amending"}]}
     )
@@ -54,7 +54,7 @@ def mock_async_transport():
     transport.put.return_value = put_response
 
     # DELETE
-    delete_response = AsyncMock()
+    delete_response = MagicMock()
     delete_response.json = MagicMock(
         return_value={"success": True, "result": [{"status": "canceling"}]}
     )
@@ -289,11 +289,11 @@ class TestAsyncOrders:
             },
         }
 
-        resp1 = AsyncMock()
+        resp1 = MagicMock()
         resp1.json = MagicMock(return_value=first_page_response)
         resp1.raise_for_status = MagicMock()
 
-        resp2 = AsyncMock()
+        resp2 = MagicMock()
         resp2.json = MagicMock(return_value=second_page_response)
         resp2.raise_for_status = MagicMock()
 
@@ -346,7 +346,7 @@ class TestAsyncOrders:
     async def test_cancel_all_orders(
         self, async_orders: AsyncOrders, mock_async_transport: AsyncMock
     ):
-        delete_response = AsyncMock()
+        delete_response = MagicMock()
         delete_response.json = MagicMock(
             return_value={"success": True, "result": [True]}
         )
@@ -390,11 +390,11 @@ class TestAsyncOrders:
             },
         }
 
-        resp1 = AsyncMock()
+        resp1 = MagicMock()
         resp1.json = MagicMock(return_value=first_page_response)
         resp1.raise_for_status = MagicMock()
 
-        resp2 = AsyncMock()
+        resp2 = MagicMock()
         resp2.json = MagicMock(return_value=second_page_response)
         resp2.raise_for_status = MagicMock()
 
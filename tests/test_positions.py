@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock
+from rabbitx.ws.positions import Positions
+
+
+def test_consume():
+    on_update = MagicMock()
+    positions = Positions(on_update=on_update)
+
+    positions.consume({
+        "positions": [
+            {"market_id": "BTC-USD", "size": "0.5"},
+            {"market_id": "ETH-USD", "size": "2"},
+        ]
+    })
+    positions.consume({
+        "positions": [
+            {"market_id": "BTC-USD", "size": "0.000"},
+            {"market_id": "SOL-USD", "size": "0"},
+        ]
+    })
+
+    assert positions.get_positions() == {
+        "ETH-USD": {"market_id": "ETH-USD", "size": "2"}
+    }
+    assert positions.get_position("BTC-USD") is None
+    on_update.assert_called_with("SOL-USD", {"market_id": "SOL-USD", "size": "0"})
+    assert on_update.call_count == 4
+
+
+def test_consume_without_size_keeps_position():
+    on_update = MagicMock()
+    positions = Positions(on_update=on_update)
+
+    positions.consume({"positions": [{"market_id": "BTC-USD", "size": "0.5"}]})
+    positions.consume({"positions": [{"market_id": "BTC-USD", "entry_price": "1"}]})
+
+    assert positions.get_position("BTC-USD") == {
+        "market_id": "BTC-USD",
+        "entry_price": "1",
+    }
+    assert on_update.call_count == 2
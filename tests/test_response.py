@@ -1,4 +1,5 @@
 import pytest
+from decimal import Decimal
 from rabbitx.response import (
     single_or_fail,
     multiple_or_fail,
@@ -87,3 +88,109 @@ def test_multiple_or_fail_no_result():
     response = {"success": True, "result": None, "request_id": None, "pagination": None}
     with pytest.raises(BadResult):
         multiple_or_fail(response, MagicMock())
+
+
+# --- MultipleResponse.next_page tests ---
+def test_next_page_uses_page_number():
+    response = {
+        "success": True,
+        "result": [{"foo": 1}],
+        "pagination": {"page": 1, "limit": 10, "order": "ASC", "has_next_page": True},
+    }
+    next_page_func = MagicMock()
+    multiple_or_fail(response, next_page_func).next_page()
+    next_page_func.assert_called_once_with({
+        "p_page": 2,
+        "p_limit": 10,
+        "p_order": "ASC",
+    })
+
+
+def test_next_page_prefers_cursor():
+    response = {
+        "success": True,
+        "result": [{"foo": 1}],
+        "pagination": {
+            "page": 1,
+            "limit": 10,
+            "order": "DESC",
+            "has_next_page": True,
+            "next_cursor": "abc",
+        },
+    }
+    next_page_func = MagicMock()
+    multiple_or_fail(response, next_page_func).next_page()
+    next_page_func.assert_called_once_with({
+        "p_cursor": "abc",
+        "p_limit": 10,
+        "p_order": "DESC",
+    })
+
+
+def _page(page, items, has_next_page):
+    return {
+        "success": True,
+        "result": items,
+        "pagination": {"page": page, "limit": 1, "has_next_page": has_next_page},
+    }
+
+
+def test_iterate_over_all_pages():
+    pages = iter([
+        multiple_or_fail(_page(2, [{"id": 2}], True), lambda _: next(pages)),
+        multiple_or_fail(_page(3, [{"id": 3}], False), None),
+    ])
+    first = multiple_or_fail(_page(1, [{"id": 1}], True), lambda _: next(pages))
+
+    assert [item["id"] for item in first] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_async_iterate_over_all_pages():
+    async def next_page_func(pagination):
+        assert pagination["p_page"] == 2
+        return multiple_or_fail(_page(2, [{"id": 2}], False), None)
+
+    first = multiple_or_fail(_page(1, [{"id": 1}], True), next_page_func)
+
+    assert [item["id"] async for item in first] == [1, 2]
+
+
+# --- MultipleResponse.records tests ---
+def test_records_convert_decimals_lazily():
+    response = {
+        "success": True,
+        "result": [{"vault_profile_id": 1, "stake_shares": "474.98", "status": "x"}],
+    }
+    record = multiple_or_fail(response).records()[0]
+    assert record._converted is None
+    assert record.stake_shares == Decimal("474.98")
+    assert record._converted == {"stake_shares": Decimal("474.98")}
+    assert record["stake_shares"] == "474.98"
+    assert record.vault_profile_id == 1
+    assert record.status == "x"
+    with pytest.raises(AttributeError):
+        record.missing
+
+
+def test_records_convert_only_plain_decimals():
+    response = {
+        "success": True,
+        "result": [
+            {
+                "order_id": "123",
+                "id": "42",
+                "amount": "-100",
+                "nan": "NaN",
+                "inf": "Infinity",
+                "exp": "1e5",
+            }
+        ],
+    }
+    record = multiple_or_fail(response).records()[0]
+    assert record.amount == Decimal("-100")
+    assert record.order_id == "123"
+    assert record.id == "42"
+    assert record.nan == "NaN"
+    assert record.inf == "Infinity"
+    assert record.exp == "1e5"
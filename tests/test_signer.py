@@ -0,0 +1,35 @@
+from unittest.mock import patch
+from rabbitx.apikey import ApiKey
+from rabbitx.signer import ApiSigner, JWTTokenSigner
+from rabbitx.xutils import new_payload, payload_hash_presorted, rbt_signature
+
+SECRET = "0x" + "ab" * 32
+TIMESTAMP = 1700000000
+PARAMS = {"market_id": "BTC-USD", "price": 100, "is_reduce": True}
+
+
+def expected_signature(method: str, endpoint: str, params: dict) -> str:
+    payload = new_payload(method, endpoint, params)
+    return rbt_signature(payload_hash_presorted(TIMESTAMP + 15, payload), SECRET)
+
+
+@patch("rabbitx.signer.get_current_timestamp", return_value=TIMESTAMP)
+def test_api_signer_headers(_):
+    signer = ApiSigner(ApiKey("key", SECRET, None, None))
+
+    assert signer.headers("post", "/orders", PARAMS) == {
+        "RBT-API-KEY": "key",
+        "RBT-TS": str(TIMESTAMP + 15),
+        "RBT-SIGNATURE": expected_signature("POST", "/orders", PARAMS),
+    }
+
+
+@patch("rabbitx.signer.get_current_timestamp", return_value=TIMESTAMP)
+def test_jwt_token_signer_headers(_):
+    signer = JWTTokenSigner("jwt", "refresh", SECRET)
+
+    assert signer.headers("get", "/account", {}) == {
+        "RBT-JWT": "jwt",
+        "RBT-TS": str(TIMESTAMP + 15),
+        "RBT-SIGNATURE": expected_signature("GET", "/account", {}),
+    }
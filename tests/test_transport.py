@@ -0,0 +1,27 @@
+import httpx
+import pytest
+from unittest.mock import MagicMock
+from rabbitx.transport import SyncTransport, AsyncTransport
+
+URL = httpx.URL("https://api.prod.rabbitx.io/markets")
+
+
+@pytest.fixture(autouse=True)
+def https_proxy(monkeypatch):
+    for name in ("NO_PROXY", "no_proxy", "ALL_PROXY", "all_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.local:3128")
+
+
+def test_sync_transport_uses_env_proxy():
+    transport = SyncTransport("https://api.prod.rabbitx.io", MagicMock())
+
+    pool = transport.client._transport_for_url(URL)._pool
+    assert type(pool).__name__ == "HTTPProxy"
+
+
+def test_async_transport_uses_env_proxy():
+    client = AsyncTransport._create_client()
+
+    pool = client._transport_for_url(URL)._pool
+    assert type(pool).__name__ == "AsyncHTTPProxy"
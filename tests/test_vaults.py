@@ -0,0 +1,182 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from rabbitx.response import multiple_or_fail
+from rabbitx.vaults import Vaults, AsyncVaults, _TTLCache
+
+
+@pytest.fixture
+def mock_transport():
+    transport = MagicMock()
+    transport.get.return_value.content = b'{"success": true, "result": []}'
+    transport.get.return_value.raise_for_status.return_value = None
+    return transport
+
+
+@pytest.fixture
+def mock_async_transport():
+    transport = AsyncMock()
+
+    get_response = MagicMock()
+    get_response.content = b'{"success": true, "result": []}'
+    get_response.raise_for_status = MagicMock()
+    transport.get.return_value = get_response
+
+    return transport
+
+
+@pytest.fixture
+def vaults(mock_transport):
+    return Vaults(mock_transport)
+
+
+@pytest.fixture
+def async_vaults(mock_async_transport):
+    return AsyncVaults(mock_async_transport)
+
+
+class TestVaults:
+    def test_holdings_without_pagination(
+        self, vaults: Vaults, mock_transport: MagicMock
+    ):
+        vaults.holdings(vault_profile_id=1)
+        mock_transport.get.assert_called_once_with(
+            "/vaults/holdings", params={"vault_profile_id": 1}
+        )
+
+    def test_fills_converts_time_to_microseconds(
+        self, vaults: Vaults, mock_transport: MagicMock
+    ):
+        vaults.fills(vault_profile_id=1, start_time=10, end_time=20)
+        mock_transport.get.assert_called_once_with(
+            "/vaults/fills",
+            params={
+                "vault_profile_id": 1,
+                "start_time": 10_000_000,
+                "end_time": 20_000_000,
+            },
+        )
+
+    def test_fills_next_page_keeps_filters(
+        self, vaults: Vaults, mock_transport: MagicMock
+    ):
+        mock_transport.get.return_value.content = (
+            b'{"success": true, "result": [],'
+            b' "pagination": {"page": 1, "limit": 1, "has_next_page": true}}'
+        )
+        vaults.fills(vault_profile_id=1, start_time=10).next_page()
+        _, kwargs = mock_transport.get.call_args
+        assert kwargs["params"] == {
+            "vault_profile_id": 1,
+            "start_time": 10_000_000,
+            "p_page": 2,
+            "p_limit": 1,
+            "p_order": "DESC",
+        }
+
+    def test_list_is_cached(self, vaults: Vaults, mock_transport: MagicMock):
+        vaults.list()
+        vaults.list()
+        mock_transport.get.assert_called_once()
+
+    def test_cached_response_is_a_copy(self, vaults: Vaults, mock_transport: MagicMock):
+        mock_transport.get.return_value.content = (
+            b'{"success": true, "result": [{"id": 1}]}'
+        )
+        first = vaults.list()
+        first.result().append({"id": 2})
+
+        second = vaults.list()
+        assert second is not first
+        assert second.result() == [{"id": 1}]
+        mock_transport.get.assert_called_once()
+
+    def test_list_without_cache(self, vaults: Vaults, mock_transport: MagicMock):
+        vaults.list()
+        vaults.list(cache=False)
+        assert mock_transport.get.call_count == 2
+
+    def test_history_cache_keyed_by_params(
+        self, vaults: Vaults, mock_transport: MagicMock
+    ):
+        vaults.history(vault_profile_id=1)
+        vaults.history(vault_profile_id=1)
+        vaults.history(vault_profile_id=2)
+        assert mock_transport.get.call_count == 2
+
+    def test_snapshot(self, vaults: Vaults, mock_transport: MagicMock):
+        snapshot = vaults.snapshot(1)
+
+        assert list(snapshot) == ["list", "holdings", "history", "fills", "funding"]
+        assert mock_transport.get.call_count == 5
+
+
+@pytest.mark.asyncio
+class TestAsyncVaults:
+    async def test_concurrent_identical_requests_are_coalesced(
+        self, async_vaults: AsyncVaults, mock_async_transport: AsyncMock
+    ):
+        first, second, other = await asyncio.gather(
+            async_vaults.holdings(vault_profile_id=1),
+            async_vaults.holdings(vault_profile_id=1),
+            async_vaults.holdings(vault_profile_id=2),
+        )
+
+        assert mock_async_transport.get.call_count == 2
+        assert first is not second
+        assert async_vaults._inflight == {}
+
+    async def test_balanceops_with_list_params(
+        self, async_vaults: AsyncVaults, mock_async_transport: AsyncMock
+    ):
+        await asyncio.gather(
+            async_vaults.all_balanceops(ops_types=["stake"]),
+            async_vaults.all_balanceops(ops_types=["stake"]),
+        )
+
+        mock_async_transport.get.assert_called_once_with(
+            "/vaults/all-balanceops", params={"ops_type": ["stake"]}
+        )
+        assert async_vaults._inflight == {}
+
+    async def test_snapshot(
+        self, async_vaults: AsyncVaults, mock_async_transport: AsyncMock
+    ):
+        snapshot = await async_vaults.snapshot(1)
+
+        assert list(snapshot) == ["list", "holdings", "history", "fills", "funding"]
+        assert mock_async_transport.get.call_count == 5
+
+        endpoints = {args[0] for args, _ in mock_async_transport.get.call_args_list}
+        assert endpoints == {
+            "/vaults",
+            "/vaults/holdings",
+            "/vaults/history",
+            "/vaults/fills",
+            "/vaults/funding",
+        }
+
+
+class TestTTLCache:
+    def test_size_is_bounded(self):
+        cache = _TTLCache(max_entries=2)
+        response = multiple_or_fail({"success": True, "result": []})
+        cache.set("a", response, ttl=60)
+        cache.set("b", response, ttl=60)
+        cache.get("a")
+        cache.set("c", response, ttl=60)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None  # least recently used
+        assert cache.get("a") is not None
+
+    def test_expired_entries_dropped_first(self):
+        cache = _TTLCache(max_entries=2)
+        response = multiple_or_fail({"success": True, "result": []})
+        cache.set("expired", response, ttl=0)
+        cache.set("a", response, ttl=60)
+        cache.set("b", response, ttl=60)
+
+        assert len(cache) == 2
+        assert cache.get("a") is not None
+        assert cache.get("b") is not None
@@ -0,0 +1,19 @@
+from unittest.mock import patch
+from eth_account import Account
+from rabbitx.wallet import Wallet
+
+PRIVATE_KEY = "0x" + "ab" * 32
+ADDRESS = "0xe239cdc5fbe977a8a141B72194D3CF8c41bC5BC6"
+
+
+def test_address():
+    assert Wallet(PRIVATE_KEY).address() == ADDRESS
+
+
+def test_key_is_decoded_once():
+    wallet = Wallet(PRIVATE_KEY)
+    with patch("rabbitx.wallet.Account.from_key", wraps=Account.from_key) as from_key:
+        assert wallet.address() == ADDRESS
+        assert wallet.address() == ADDRESS
+        assert wallet.account.address == ADDRESS
+    from_key.assert_called_once_with(PRIVATE_KEY)
@@ -0,0 +1,184 @@
+import os
+import queue
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from websockets.exceptions import ConnectionClosedOK
+from rabbitx.ws.ws import WS, TooManyPendingRequests, _HandlerQueue
+
+
+@pytest.fixture
+def ws():
+    ws = WS(token="token", url="wss://example.com/ws")
+    ws.conn = MagicMock()
+    return ws
+
+
+class TestWS:
+    def test_request_sends_json_text_frame(self, ws: WS):
+        callback = MagicMock()
+
+        ws.request({"subscribe": {"channel": "c"}}, callback)
+        ws.conn.send.assert_called_once_with(
+            b'{"subscribe":{"channel":"c"},"id":1}', text=True
+        )
+
+        ws._process_message(b'{"id": 1, "subscribe": {"data": {}}}')
+        callback.assert_called_once_with({"id": 1, "subscribe": {"data": {}}})
+
+    def test_concurrent_requests_get_unique_ids(self, ws: WS):
+        threads = [
+            threading.Thread(
+                target=lambda: [ws.request({}, MagicMock()) for _ in range(200)]
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(ws.promises) == list(range(1, 801))
+
+    def test_late_reply_does_not_reach_newer_request(self, ws: WS):
+        first, second = MagicMock(), MagicMock()
+        ws.request({}, first)
+        ws._process_message(b'{"id": 1}')
+        ws.request({}, second)
+        ws._process_message(b'{"id": 1}')  # duplicate reply to the first request
+
+        first.assert_called_once_with({"id": 1})
+        second.assert_not_called()
+        assert list(ws.promises) == [2]
+
+    def test_too_many_pending_requests(self, ws: WS):
+        with patch("rabbitx.ws.ws.MAX_PENDING_REQUESTS", 2):
+            ws.request({}, MagicMock())
+            ws.request({}, MagicMock())
+            with pytest.raises(TooManyPendingRequests):
+                ws.request({}, MagicMock())
+            ws._process_message(b'{"id": 1}')
+            ws.request({}, MagicMock())
+
+        assert sorted(ws.promises) == [2, 3]
+
+    def test_subscribes_after_authorize_share_a_frame(self, ws: WS):
+        ws.channels = ["a", "b"]
+        ws.connected = True
+        ws._authorize()
+        ws._process_message(b'{"id": 1, "connect": {}}')
+
+        assert ws.conn.send.call_args_list[1].args == (
+            b'{"subscribe":{"channel":"a"},"id":2}\n'
+            b'{"subscribe":{"channel":"b"},"id":3}',
+        )
+        assert ws.conn.send.call_count == 2
+        assert ws._send_buffer is None
+
+    def test_heartbeat_in_batched_frame(self, ws: WS):
+        conn = ws.conn
+        conn.recv.side_effect = [
+            b'{}\n{"push": {"channel": "c", "pub": {"data": 1}}}',
+            ConnectionClosedOK(None, None),
+        ]
+
+        ws._run()
+
+        conn.send.assert_called_once_with(b"{}", text=True)
+        assert ws._handler_queue.get_nowait() == ("message", ("c", 1))
+
+    def test_process_push_message(self, ws: WS):
+        ws._process_message(b'{"push": {"channel": "c", "pub": {"data": {"a": 1}}}}')
+
+        assert ws._handler_queue.get_nowait() == ("message", ("c", {"a": 1}))
+
+    def test_handler_worker_dispatch(self, ws: WS):
+        handled = threading.Event()
+        ws.on_message = MagicMock(
+            side_effect=lambda channel, _: channel == "other" and handled.set()
+        )
+        handler = MagicMock()
+        ws.register_handler("c", handler)
+        ws._handler_queue.put(("subscribe", ("c", {"s": 1})))
+        ws._handler_queue.put(("message", ("c", {"a": 1})))
+        ws._handler_queue.put(("message", ("other", {"b": 2})))
+
+        worker = threading.Thread(target=ws._handler_worker)
+        worker.start()
+        assert handled.wait(timeout=1)
+        ws._stop_handler_worker()
+        worker.join(timeout=1)
+        assert not worker.is_alive()
+
+        handler.on_subscribe.assert_called_once_with({"s": 1})
+        handler.on_data.assert_called_once_with({"a": 1})
+        ws.on_message.assert_called_with("other", {"b": 2})
+
+    def test_handlers_are_read_only(self, ws: WS):
+        handler = MagicMock()
+        ws.register_handler("c", handler)
+
+        assert ws.handlers == {"c": (handler,)}
+        with pytest.raises(TypeError):
+            ws.handlers["d"] = [handler]
+        with pytest.raises(AttributeError):
+            ws.handlers["c"].append(handler)
+
+        ws.unregister_handler("c", handler)
+        assert ws.handlers == {}
+        assert ws._data_callbacks["c"] == ()
+
+    def test_stop_unblocks_run(self, ws: WS):
+        closed = threading.Event()
+
+        def recv(**kwargs):
+            closed.wait()
+            raise ConnectionClosedOK(None, None)
+
+        conn = ws.conn
+        conn.recv.side_effect = recv
+        conn.close.side_effect = closed.set
+        ws._websocket_thread = threading.Thread(target=ws._run)
+        ws._websocket_thread.start()
+
+        ws.stop()
+
+        assert ws._websocket_thread is None
+        assert ws.conn is None
+        conn.recv.assert_called_once_with(decode=False)
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity"), reason="sched_setaffinity is Linux only"
+)
+def test_cpu_affinity():
+    cpu = min(os.sched_getaffinity(0))
+    with pytest.raises(ValueError):
+        WS(token="token", url="wss://example.com/ws", cpu_affinity=(cpu, -1))
+
+    ws = WS(token="token", url="wss://example.com/ws", cpu_affinity=(cpu, cpu))
+    with patch("rabbitx.ws.ws.os.sched_setaffinity") as sched_setaffinity:
+        ws._pin_thread(1)
+    sched_setaffinity.assert_called_once_with(0, {cpu})
+
+
+def test_handler_queue():
+    q = _HandlerQueue()
+    with pytest.raises(queue.Empty):
+        q.get_nowait()
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.01)
+
+    producer = threading.Thread(target=lambda: [q.put(i) for i in range(1000)])
+    producer.start()
+    assert [q.get(timeout=1) for _ in range(1000)] == list(range(1000))
+    producer.join()
+
+
+def test_handler_queue_drain():
+    q = _HandlerQueue()
+    assert q.drain() == []
+    for i in range(3):
+        q.put(i)
+    assert q.drain() == [0, 1, 2]
+    assert q.drain() == []
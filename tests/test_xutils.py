@@ -0,0 +1,99 @@
+import hashlib
+from unittest.mock import patch
+from rabbitx.xutils import (
+    api_headers,
+    dict_get_path,
+    dict_has_path,
+    new_payload,
+    payload_hash,
+    payload_hash_presorted,
+    rbt_signature,
+    RbtSigner,
+)
+
+TIMESTAMP = 1700000000
+SECRET = "0x" + "ab" * 32
+PARAMS = {
+    "market_id": "BTC-USD",
+    "size": 0.1,
+    "price": 100,
+    "type": "limit",
+    "is_reduce": True,
+    "status": ["open", "closed"],
+}
+EXPECTED_HASH = "0xdd7e0cc40183a7de21eb5531fdf1cfae96513fef01eef79f46d9e2b6fedff605"
+EXPECTED_SIGNATURE = (
+    "0x1f036164ea0d9e53794a43008d04420acc48d7c42703334913fbab730476c2a8"
+)
+
+
+def test_new_payload_is_sorted_by_key():
+    payload = new_payload("POST", "/orders", PARAMS)
+    keys = [item["key"] for item in payload]
+    assert keys == sorted(keys)
+    assert {"key": "is_reduce", "value": "true"} in payload
+
+
+def test_payload_hash():
+    payload = new_payload("POST", "/orders", PARAMS)
+    assert payload_hash(TIMESTAMP, payload) == EXPECTED_HASH
+    assert payload_hash(TIMESTAMP, list(reversed(payload))) == EXPECTED_HASH
+
+
+def test_payload_hash_presorted():
+    payload = new_payload("POST", "/orders", PARAMS)
+    assert payload_hash_presorted(TIMESTAMP, payload) == EXPECTED_HASH
+
+
+def test_rbt_signature():
+    assert rbt_signature(EXPECTED_HASH, SECRET) == EXPECTED_SIGNATURE
+    assert rbt_signature(EXPECTED_HASH, SECRET[2:]) == EXPECTED_SIGNATURE
+
+
+def test_rbt_signer():
+    signer = RbtSigner(SECRET)
+    assert signer.sign(EXPECTED_HASH) == EXPECTED_SIGNATURE
+    assert signer.sign(EXPECTED_HASH[2:]) == EXPECTED_SIGNATURE
+    assert RbtSigner(SECRET[2:]).sign(EXPECTED_HASH) == EXPECTED_SIGNATURE
+
+
+def test_rbt_signer_sign_request():
+    signer = RbtSigner(SECRET)
+    signature = signer.sign_request(TIMESTAMP, "POST", "/orders", PARAMS)
+    assert signature == EXPECTED_SIGNATURE
+
+
+def test_rbt_signer_remembers_current_second():
+    signer = RbtSigner(SECRET)
+    with patch("rabbitx.xutils.hashlib.sha256", wraps=hashlib.sha256) as sha256:
+        signer.sign_request(TIMESTAMP, "POST", "/orders", PARAMS)
+        retry = signer.sign_request(TIMESTAMP, "POST", "/orders", PARAMS)
+        assert sha256.call_count == 1
+        assert retry == EXPECTED_SIGNATURE
+
+        signer.sign_request(TIMESTAMP + 1, "POST", "/orders", PARAMS)
+        assert sha256.call_count == 2
+    assert len(signer._signed) == 1
+
+
+def test_dict_path():
+    d = {"a": {"b": {"c": 1}, "n": None}, "x": 2}
+
+    assert dict_get_path(d, "a.b.c") == 1
+    assert dict_get_path(d, "a.b.d") is None
+    assert dict_get_path(d, "x.y") is None
+    assert dict_has_path(d, "a.b")
+    assert dict_has_path(d, "a.n")
+    assert not dict_has_path(d, "a.n.c")
+    assert not dict_has_path(d, "x.y")
+
+
+@patch("rabbitx.xutils.get_current_timestamp", return_value=TIMESTAMP)
+def test_api_headers_reuses_signer(_):
+    first = api_headers("post", "/orders", "key", SECRET, PARAMS)
+    with patch("rabbitx.xutils.hashlib.sha256", wraps=hashlib.sha256) as sha256:
+        second = api_headers("post", "/orders", "key", SECRET, PARAMS)
+
+    assert first == second
+    assert first["RBT-TS"] == str(TIMESTAMP + 15)
+    sha256.assert_not_called()